@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/4.1/ref/settings/
 """
 
 from pathlib import Path
+from tempfile import gettempdir
 from datetime import timedelta
 import configparser
 
@@ -51,6 +52,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "crm.middleware.QueryProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -84,17 +86,115 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/4.1/ref/settings/#databases
 
+# DB_POOL_SIZE > 0 takes the connections from an in-process pool of that
+# size per worker (crm/db/pooled_postgresql); keep CONN_MAX_AGE at 0 then,
+# as closing the connection gives it back to the pool.
+DB_POOL_SIZE = int(config['DEFAULT'].get('DB_POOL_SIZE', '0'))
+
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql_psycopg2",
+        "ENGINE": "crm.db.pooled_postgresql"
+        if DB_POOL_SIZE
+        else "django.db.backends.postgresql_psycopg2",
         "NAME": config['DEFAULT']['DB_NAME'],
         "USER": config['DEFAULT']['DB_USER'],
         "PASSWORD": config['DEFAULT']['DB_PASSWORD'],
         "HOST": config['DEFAULT']['DB_HOST'],
         "PORT": config['DEFAULT']['DB_PORT'],
+        "CONN_MAX_AGE": int(
+            config['DEFAULT'].get(
+                'DB_CONN_MAX_AGE', '0' if DB_POOL_SIZE else '60'
+            )
+        ),
+        "CONN_HEALTH_CHECKS": config['DEFAULT'].getboolean(
+            'DB_CONN_HEALTH_CHECKS', True
+        ),
+        "POOL": {"MIN_SIZE": 1, "MAX_SIZE": DB_POOL_SIZE},
+    }
+}
+
+# Read replicas serving the GET requests of the viewsets, as a comma
+# separated list of host[:port] in DB_REPLICA_HOSTS, see crm/db/replicas.py
+DB_REPLICA_HOSTS = [
+    host.strip()
+    for host in config['DEFAULT'].get('DB_REPLICA_HOSTS', '').split(',')
+    if host.strip()
+]
+for number, replica in enumerate(DB_REPLICA_HOSTS, 1):
+    host, _, port = replica.partition(':')
+    DATABASES[f"replica{number}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
     }
+
+DATABASE_ROUTERS = ['crm.db.replicas.ReplicaRouter']
+
+# A user reads from the primary for STICKY_SECONDS after a write, to see
+# their own changes despite the replication lag. The pins are stored in
+# CACHE_ALIAS, which must be shared by the workers.
+CRM_REPLICAS = {
+    'ALIASES': [alias for alias in DATABASES if alias != "default"],
+    'STICKY_SECONDS': 5,
+    'CACHE_ALIAS': 'default',
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+# The caches hold versions bumped by one worker and read by the others
+# (user versions revoking the tokens, permissions), so they must be
+# shared by the workers: FileBasedCache on a single host, RedisCache or
+# PyMemcacheCache otherwise. A process local LocMemCache fails the
+# crm.E001 check.
+
+CACHES = {
+    "default": {
+        "BACKEND": config['DEFAULT'].get(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.filebased.FileBasedCache',
+        ),
+        "LOCATION": config['DEFAULT'].get(
+            'CACHE_LOCATION', str(Path(gettempdir()) / 'crm-cache')
+        ),
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+    # List responses of crm.events.cache.ResponseCacheMixin, invalidated
+    # by scope versions bumped by the worker handling the write, so also
+    # shared. FileBasedCache culls entries beyond MAX_ENTRIES; RedisCache
+    # evicts the least recently used ones with maxmemory-policy
+    # allkeys-lru (requires the redis package).
+    "responses": {
+        "BACKEND": config['DEFAULT'].get(
+            'RESPONSE_CACHE_BACKEND',
+            'django.core.cache.backends.filebased.FileBasedCache',
+        ),
+        "LOCATION": config['DEFAULT'].get(
+            'RESPONSE_CACHE_LOCATION',
+            str(Path(gettempdir()) / 'crm-responses'),
+        ),
+        "TIMEOUT": int(config['DEFAULT'].get('RESPONSE_CACHE_TIMEOUT', '30')),
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
 }
 
+# Cache alias of the list responses (None to disable)
+CRM_RESPONSE_CACHE = {
+    'ALIAS': 'responses',
+}
+
+# Permission codenames cached by crm.users.backends.CachedModelBackend,
+# in a process local LRU then in the given cache alias (None to disable).
+PERMISSIONS_CACHE = {
+    'ALIAS': 'default',
+    'LOCAL_SIZE': 1024,
+}
+
+AUTHENTICATION_BACKENDS = [
+    "crm.users.backends.CachedModelBackend",
+]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -140,17 +240,45 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # Configurer mon sysème d'auth
 AUTH_USER_MODEL = "users.User"
 
+# Password hashing of the login view, see crm/users/hashing.py
+LOGIN_HASHING_WORKERS = 2
+LOGIN_HASHING_QUEUE_SIZE = 16
+
 REST_FRAMEWORK = {
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    'DEFAULT_PAGINATION_CLASS': 'crm.events.pagination.CRMPagination',
     'PAGE_SIZE': 4,
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'crm.users.authentication.StatelessJWTAuthentication',
     ),
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend'
     ],
 }
 
+# Keyset pagination, enabled with ?pagination=cursor on the list endpoints
+CRM_PAGINATION = {
+    'CURSOR_PAGE_SIZE': 4,
+    'MAX_PAGE_SIZE': 100,
+}
+
+# Query budgets of crm.middleware.QueryProfilingMiddleware, per route name
+CRM_QUERY_BUDGETS = {
+    'DEFAULT': {'QUERIES': 20, 'TIME_MS': 500},
+    'ROUTES': {
+        'login': {'TIME_MS': 1000},
+    },
+    'DUPLICATE_THRESHOLD': 3,
+}
+
+# Histograms served on /metrics, see crm/metrics.py. Each worker writes
+# its own file in DIRECTORY (every FLUSH_INTERVAL seconds) so that
+# /metrics sums all the workers; without DIRECTORY only the worker
+# answering the scrape is reported.
+CRM_METRICS = {
+    'DIRECTORY': config['DEFAULT'].get('METRICS_DIR', None),
+    'FLUSH_INTERVAL': 5,
+}
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=15),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=16),
@@ -159,24 +287,42 @@ SIMPLE_JWT = {
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'filters': {
+        'sample_debug': {
+            '()': 'crm.log.SamplingFilter',
+            'rate': config['DEFAULT'].get('LOG_DEBUG_SAMPLE_RATE', '0.1'),
+        },
+    },
     'handlers': {
         'file': {
             'level': 'DEBUG',
-            'class': 'logging.FileHandler',
+            'class': 'crm.log.QueueListenerHandler',
             'filename': 'general.log',
-            'formatter': 'verbose',
+            'max_bytes': 10 * 1024 * 1024,
+            'backup_count': 5,
+            'formatter': 'json',
+            'filters': ['sample_debug'],
         },
     },
     'loggers': {
         '': {
             'handlers': ['file'],
-            'level': 'DEBUG',
+            'level': 'WARNING',
             'propagate': True,
         },
+        'crm': {
+            'level': config['DEFAULT'].get('LOG_LEVEL', 'DEBUG'),
+        },
+        'django': {
+            'level': 'INFO',
+        },
+        'django.db.backends': {
+            'level': 'WARNING',
+        },
     },
     'formatters': {
-        'verbose': {
-            'format': '%(levelname)s %(asctime)s %(module)s: %(message)s'
-        }
+        'json': {
+            '()': 'crm.log.JsonFormatter',
+        },
     },
 }
@@ -15,12 +15,23 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from rest_framework import routers
-
-from crm.events.views import ClientViewset, ContractViewset, EventViewset
+from crm.events.async_views import (
+    AsyncClientView,
+    AsyncContractView,
+    AsyncEventView,
+)
+from crm.events.bulk import BulkRouter
+from crm.events.stats import stats
+from crm.events.views import (
+    ClientViewset,
+    ContractViewset,
+    EventViewset,
+    sales_summary,
+)
+from crm.metrics import metrics
 from crm.users.views import login
 
-router = routers.SimpleRouter()
+router = BulkRouter()
 
 router.register('clients', ClientViewset, basename='client')
 router.register('contracts', ContractViewset, basename='contract')
@@ -30,5 +41,39 @@ router.register('events', EventViewset, basename='event')
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/login/", login, name='login'),
+    path("api/stats/", stats, name='stats'),
+    path("api/summary/", sales_summary, name='sales-summary'),
     path("api/", include(router.urls)),
+    # Async list and retrieve, for an ASGI server
+    path(
+        "api/async/clients/",
+        AsyncClientView.as_view(),
+        name='async-client-list',
+    ),
+    path(
+        "api/async/clients/<pk>/",
+        AsyncClientView.as_view(),
+        name='async-client-detail',
+    ),
+    path(
+        "api/async/contracts/",
+        AsyncContractView.as_view(),
+        name='async-contract-list',
+    ),
+    path(
+        "api/async/contracts/<pk>/",
+        AsyncContractView.as_view(),
+        name='async-contract-detail',
+    ),
+    path(
+        "api/async/events/",
+        AsyncEventView.as_view(),
+        name='async-event-list',
+    ),
+    path(
+        "api/async/events/<pk>/",
+        AsyncEventView.as_view(),
+        name='async-event-detail',
+    ),
+    path("metrics", metrics, name='metrics'),
 ]
@@ -0,0 +1,88 @@
+import os
+from threading import Lock
+
+import psycopg2.extras
+from django.db.backends.postgresql import base
+from psycopg2 import pool
+
+_pools = {}
+_pools_lock = Lock()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL backend taking its connections from an in-process pool.
+
+    Closing the connection (at the end of each request when CONN_MAX_AGE
+    is 0) gives it back to the pool instead of closing the socket, so a
+    request does not pay the TCP and authentication handshake. The pool
+    holds up to `POOL['MAX_SIZE']` connections per process: it must be at
+    least the number of threads of a worker, as an exhausted pool raises
+    a database error instead of waiting.
+    """
+
+    def get_pool(self, conn_params):
+        # A forked worker must not share the sockets of its parent.
+        key = (self.alias, os.getpid())
+        with _pools_lock:
+            connection_pool = _pools.get(key)
+            if connection_pool is None:
+                options = self.settings_dict.get('POOL', {})
+                connection_pool = pool.ThreadedConnectionPool(
+                    options.get('MIN_SIZE', 1),
+                    options.get('MAX_SIZE', 10),
+                    **conn_params,
+                )
+                _pools[key] = connection_pool
+            return connection_pool
+
+    def get_pooled_connection(self, connection_pool):
+        for i in range(connection_pool.maxconn):
+            connection = connection_pool.getconn()
+            if connection.closed:
+                connection_pool.putconn(connection, close=True)
+            elif self.settings_dict['CONN_HEALTH_CHECKS'] and not (
+                self.is_pooled_connection_usable(connection)
+            ):
+                connection_pool.putconn(connection, close=True)
+            else:
+                return connection
+        return connection_pool.getconn()
+
+    def is_pooled_connection_usable(self, connection):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        except psycopg2.Error:
+            return False
+        connection.rollback()
+        return True
+
+    def get_new_connection(self, conn_params):
+        connection = self.get_pooled_connection(self.get_pool(conn_params))
+
+        # Same setup as the parent get_new_connection, which connects
+        # directly.
+        options = self.settings_dict['OPTIONS']
+        try:
+            self.isolation_level = options['isolation_level']
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+        psycopg2.extras.register_default_jsonb(
+            conn_or_curs=connection, loads=lambda x: x
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            connection_pool = _pools.get((self.alias, os.getpid()))
+            with self.wrap_database_errors:
+                if connection_pool is None:
+                    return self.connection.close()
+                # putconn rolls back an unfinished transaction and closes
+                # a broken connection.
+                return connection_pool.putconn(
+                    self.connection, close=bool(self.connection.closed)
+                )
@@ -0,0 +1,112 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+PINNED_CACHE_KEY = 'crm:users:{user_id}:pinned'
+
+_read_from_replicas = ContextVar('read_from_replicas', default=False)
+
+
+def get_replicas_setting(name):
+    defaults = {
+        'ALIASES': [],
+        'STICKY_SECONDS': 5,
+        'CACHE_ALIAS': 'default',
+    }
+    return getattr(settings, 'CRM_REPLICAS', {}).get(name, defaults[name])
+
+
+def choose_replica():
+    return random.choice(get_replicas_setting('ALIASES'))
+
+
+@contextmanager
+def reading_from_replicas():
+    """Send the reads of the block to the replicas."""
+    token = _read_from_replicas.set(True)
+    try:
+        yield
+    finally:
+        _read_from_replicas.reset(token)
+
+
+def get_pins_cache():
+    # Shared by the workers (see the crm.E001 check): the next read of the
+    # user may reach another worker.
+    return caches[get_replicas_setting('CACHE_ALIAS')]
+
+
+def pin_user(user_id):
+    """Read from the primary for the next STICKY_SECONDS, so that the user
+    sees their own writes despite the replication lag."""
+    get_pins_cache().set(
+        PINNED_CACHE_KEY.format(user_id=user_id),
+        True,
+        get_replicas_setting('STICKY_SECONDS'),
+    )
+
+
+def is_pinned(user_id):
+    return bool(get_pins_cache().get(PINNED_CACHE_KEY.format(user_id=user_id)))
+
+
+class ReplicaRouter:
+    """Send the reads to a random replica inside `reading_from_replicas`,
+    everything else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        if not _read_from_replicas.get() or not get_replicas_setting(
+            'ALIASES'
+        ):
+            return None
+        # A transaction must read its own writes.
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return choose_replica()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaReadMixin:
+    """Serve the safe requests of a viewset from the replicas, unless the
+    user wrote something in the last STICKY_SECONDS."""
+
+    replica_token = None
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            response = super().dispatch(request, *args, **kwargs)
+        finally:
+            if self.replica_token is not None:
+                _read_from_replicas.reset(self.replica_token)
+                self.replica_token = None
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and get_replicas_setting('ALIASES')
+            and self.request.user.is_authenticated
+        ):
+            pin_user(self.request.user.id)
+        return response
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (
+            request.method in SAFE_METHODS
+            and get_replicas_setting('ALIASES')
+            and not is_pinned(request.user.id)
+        ):
+            self.replica_token = _read_from_replicas.set(True)
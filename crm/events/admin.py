@@ -1,8 +1,9 @@
 from django.contrib import admin
-from .models import Client, Contract, Event, EventStatus
+from .models import Client, Contract, Event, EventStatus, SalesSummary
 
 
 admin.site.register(Client)
 admin.site.register(Contract)
 admin.site.register(Event)
 admin.site.register(EventStatus)
+admin.site.register(SalesSummary)
@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class EventsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "crm.events"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from crm.middleware import install_query_profiling
+
+        from . import checks, signals  # noqa: F401
+
+        # Before the first connection, so that every connection (of every
+        # thread) profiles its queries.
+        connection_created.connect(install_query_profiling)
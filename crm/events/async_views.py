@@ -0,0 +1,131 @@
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import SynchronousOnlyOperation
+from django.http import JsonResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.utils.encoders import JSONEncoder
+
+from crm.users.authentication import StatelessJWTAuthentication
+
+from .pagination import CRMPagination
+from .views import ClientViewset, ContractViewset, EventViewset
+
+
+async def afetch(queryset):
+    """Evaluate the queryset with the async ORM."""
+    if queryset._prefetch_related_lookups:
+        # aiterator() does not run the prefetch_related() lookups.
+        return [obj async for obj in queryset]
+    return [obj async for obj in queryset.aiterator()]
+
+
+class AsyncReadView(View):
+    """Async list and retrieve of the objects of a viewset.
+
+    The viewset builds the role scoped and filtered queryset and
+    serializes the page, so both paths return the same data; the
+    authentication and the queries are awaited instead of running the
+    whole request in a thread.
+    """
+
+    viewset_class = None
+    authentication = StatelessJWTAuthentication()
+
+    def json_response(self, data, status=status.HTTP_200_OK):
+        return JsonResponse(
+            data, status=status, encoder=JSONEncoder, safe=False
+        )
+
+    def error_response(self, exc):
+        return self.json_response({'detail': exc.detail}, exc.status_code)
+
+    async def get(self, request, pk=None):
+        try:
+            result = await self.authentication.aauthenticate(request)
+        except APIException as exc:
+            return self.error_response(exc)
+        if result is None:
+            return self.json_response(
+                {'detail': "Authentication credentials were not provided."},
+                status.HTTP_401_UNAUTHORIZED,
+            )
+
+        drf_request = Request(request)
+        drf_request.user, drf_request.auth = result
+        viewset = self.viewset_class(
+            request=drf_request,
+            args=(),
+            kwargs={} if pk is None else {'pk': pk},
+            action='list' if pk is None else 'retrieve',
+            format_kwarg=None,
+        )
+        try:
+            queryset = await self.get_queryset(viewset)
+            if pk is None:
+                return await self.list(viewset, queryset)
+            return await self.retrieve(viewset, queryset, pk)
+        except APIException as exc:
+            return self.error_response(exc)
+
+    async def get_queryset(self, viewset):
+        queryset = viewset.get_queryset()
+        try:
+            return viewset.filter_queryset(queryset)
+        except SynchronousOnlyOperation:
+            # A filter validating its value against the database
+            # (e.g. ?client= on the contracts).
+            return await sync_to_async(viewset.filter_queryset)(queryset)
+
+    async def list(self, viewset, queryset):
+        paginator = CRMPagination()
+        paginator.request = viewset.request
+        paginator.limit = paginator.get_limit(viewset.request)
+        paginator.offset = paginator.get_offset(viewset.request)
+        if paginator.limit is None:
+            objects = await afetch(queryset)
+            serializer = viewset.get_serializer(objects, many=True)
+            return self.json_response(serializer.data)
+
+        paginator.count = await queryset.acount()
+        objects = await afetch(
+            queryset[paginator.offset : paginator.offset + paginator.limit]
+        )
+        serializer = viewset.get_serializer(objects, many=True)
+        return self.json_response(
+            OrderedDict(
+                [
+                    ('count', paginator.count),
+                    ('next', paginator.get_next_link()),
+                    ('previous', paginator.get_previous_link()),
+                    ('results', serializer.data),
+                ]
+            )
+        )
+
+    async def retrieve(self, viewset, queryset, pk):
+        try:
+            instance = await queryset.filter(pk=pk).afirst()
+        except (TypeError, ValueError):
+            instance = None
+        if instance is None:
+            return self.json_response(
+                {'detail': "Not found."}, status.HTTP_404_NOT_FOUND
+            )
+        serializer = viewset.get_serializer(instance)
+        return self.json_response(serializer.data)
+
+
+class AsyncClientView(AsyncReadView):
+    viewset_class = ClientViewset
+
+
+class AsyncContractView(AsyncReadView):
+    viewset_class = ContractViewset
+
+
+class AsyncEventView(AsyncReadView):
+    viewset_class = EventViewset
@@ -0,0 +1,242 @@
+from collections import Counter
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+from rest_framework.routers import Route, SimpleRouter
+from rest_framework.serializers import ListSerializer, PrimaryKeyRelatedField
+
+from .cache import invalidate_responses
+from .summary import refresh_summaries
+
+BULK_BATCH_SIZE = 1000
+
+
+class BulkRouter(SimpleRouter):
+    """SimpleRouter also routing a PUT on the list route to `bulk_update`."""
+
+    routes = [
+        Route(
+            url=route.url,
+            mapping={**route.mapping, 'put': 'bulk_update'},
+            name=route.name,
+            detail=route.detail,
+            initkwargs=route.initkwargs,
+        )
+        if isinstance(route, Route) and not route.detail
+        else route
+        for route in SimpleRouter.routes
+    ]
+
+
+class PrefetchedPrimaryKeyRelatedField(PrimaryKeyRelatedField):
+    """Primary key field resolving the objects loaded by BulkListSerializer
+    instead of running one query per item."""
+
+    prefetched = None
+
+    def to_internal_value(self, data):
+        if self.prefetched is not None:
+            pk_field = self.get_queryset().model._meta.pk
+            try:
+                return self.prefetched[pk_field.to_python(data)]
+            except (KeyError, TypeError, ValidationError):
+                pass
+        return super().to_internal_value(data)
+
+
+class BulkListSerializer(ListSerializer):
+    """List serializer validating a batch of items with one query per
+    related field and writing it with bulk_create/bulk_update."""
+
+    def prefetch_related_objects(self, data):
+        for field_name, field in self.child.fields.items():
+            if field.read_only or not isinstance(
+                field, PrefetchedPrimaryKeyRelatedField
+            ):
+                continue
+            pk_field = field.get_queryset().model._meta.pk
+            pks = set()
+            for item in data:
+                if isinstance(item, dict) and item.get(field_name):
+                    try:
+                        pks.add(pk_field.to_python(item[field_name]))
+                    except (TypeError, ValidationError):
+                        pass
+            field.prefetched = field.get_queryset().in_bulk(pks)
+
+    def clear_related_objects(self):
+        for field in self.child.fields.values():
+            if isinstance(field, PrefetchedPrimaryKeyRelatedField):
+                field.prefetched = None
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            self.prefetch_related_objects(data)
+        try:
+            return super().to_internal_value(data)
+        finally:
+            self.clear_related_objects()
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        return model.objects.bulk_create(
+            [model(**attrs) for attrs in validated_data],
+            batch_size=BULK_BATCH_SIZE,
+        )
+
+    def update(self, instances, validated_data):
+        model = self.child.Meta.model
+        fields = set()
+        for instance, attrs in zip(instances, validated_data):
+            for attr, value in attrs.items():
+                setattr(instance, attr, value)
+                fields.add(attr)
+        if fields:
+            # bulk_update does not call pre_save, which sets the auto_now
+            # fields (last_modified).
+            for field in model._meta.concrete_fields:
+                if getattr(field, 'auto_now', False):
+                    for instance in instances:
+                        field.pre_save(instance, add=False)
+                    fields.add(field.name)
+            model.objects.bulk_update(
+                instances, fields, batch_size=BULK_BATCH_SIZE
+            )
+        return instances
+
+
+class BulkModelMixin:
+    """Create (POST) or update (PUT) a list of objects on the list route.
+
+    The items are validated as a batch, the permissions are checked once
+    for the whole batch and the objects are written in one transaction.
+    Nothing is written if one item is invalid: the response then holds
+    one error dict per item, empty for the valid ones.
+    """
+
+    bulk_create_permission = None
+    bulk_update_permission = None
+    bulk_denied_message = "You are not allowed."
+
+    def prepare_bulk_item(self, item):
+        """Return the data of an item, completed like a single create."""
+        return item
+
+    def check_bulk_create_permissions(self, validated_data):
+        """Return one error (or None) per validated item."""
+        return [None] * len(validated_data)
+
+    def perform_bulk_save(self, serializer):
+        return serializer.save()
+
+    def bulk_denied(self):
+        return Response(
+            {'message': self.bulk_denied_message},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    def bulk_response(self, serializer, errors, success_status):
+        if any(errors):
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            objects = self.perform_bulk_save(serializer)
+            # bulk_create/bulk_update send no post_save.
+            invalidate_responses(objects)
+            refresh_summaries(objects)
+        return Response(serializer.data, status=success_status)
+
+    def format_permission_errors(self, permission_errors):
+        return [
+            {'detail': error} if error else {} for error in permission_errors
+        ]
+
+    def get_bulk_data(self, request):
+        return [
+            self.prepare_bulk_item(dict(item))
+            if isinstance(item, dict)
+            else item
+            for item in request.data
+        ]
+
+    def bulk_create(self, request):
+        if not request.user.has_perm(self.bulk_create_permission):
+            return self.bulk_denied()
+        data = self.get_bulk_data(request)
+        serializer = self.get_serializer(data=data, many=True)
+        if serializer.is_valid():
+            permission_errors = self.check_bulk_create_permissions(
+                serializer.validated_data
+            )
+            errors = self.format_permission_errors(permission_errors)
+        else:
+            errors = serializer.errors
+        return self.bulk_response(serializer, errors, status.HTTP_201_CREATED)
+
+    def bulk_update(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            return Response(
+                {'message': "Expected a list of items."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not request.user.has_perm(self.bulk_update_permission):
+            return self.bulk_denied()
+
+        data = self.get_bulk_data(request)
+        pks, id_errors = self.get_bulk_pks(data)
+        instances = self.get_queryset().in_bulk(
+            [pk for pk in pks if pk is not None]
+        )
+
+        occurrences = Counter(pks)
+        permission_errors = []
+        for pk in pks:
+            if pk is None:
+                permission_errors.append(None)
+            elif occurrences[pk] > 1:
+                permission_errors.append("Duplicated id.")
+            elif pk not in instances:
+                permission_errors.append("Not found.")
+            else:
+                permission_errors.append(
+                    self.get_bulk_object_error(request, instances[pk])
+                )
+        if any(permission_errors) or any(id_errors):
+            errors = self.format_permission_errors(permission_errors)
+            for error, id_error in zip(errors, id_errors):
+                if id_error:
+                    error['id'] = id_error
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = self.get_serializer(
+            [instances[pk] for pk in pks], data=data, many=True
+        )
+        errors = [] if serializer.is_valid() else serializer.errors
+        return self.bulk_response(serializer, errors, status.HTTP_200_OK)
+
+    def get_bulk_pks(self, data):
+        """Return the pk of each item, converted like the model field
+        (`"12"` is `12`), and the errors of the missing or invalid ids."""
+        pk_field = self.get_queryset().model._meta.pk
+        pks = []
+        id_errors = []
+        for item in data:
+            pk = item.get('id') if isinstance(item, dict) else None
+            try:
+                if pk is None:
+                    raise ValidationError("This field is required.")
+                pks.append(pk_field.to_python(pk))
+                id_errors.append(None)
+            except ValidationError as exc:
+                pks.append(None)
+                id_errors.append(exc.messages)
+        return pks, id_errors
+
+    def get_bulk_object_error(self, request, instance):
+        try:
+            self.check_object_permissions(request, instance)
+        except APIException as exc:
+            return exc.detail
+        return None
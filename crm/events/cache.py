@@ -0,0 +1,176 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import parse_http_date_safe
+from rest_framework.response import Response
+
+from crm.users.roles import is_sales, is_support
+
+from .models import Client
+
+RESPONSE_CACHE_KEY = 'crm:responses:{user_id}:v{version}:{path}:{digest}'
+SCOPE_VERSION_KEY = 'crm:responses:scope:{scope}:version'
+# Scope of the users seeing every object (neither sales nor support).
+ALL_SCOPE = 'all'
+
+
+def get_response_cache_setting(name):
+    defaults = {
+        'ALIAS': 'responses',
+    }
+    return getattr(settings, 'CRM_RESPONSE_CACHE', {}).get(
+        name, defaults[name]
+    )
+
+
+def get_response_cache():
+    alias = get_response_cache_setting('ALIAS')
+    return caches[alias] if alias else None
+
+
+def get_scope(user):
+    """Return the invalidation scope of the lists of the user."""
+    if is_sales(user) or is_support(user):
+        return str(user.id)
+    return ALL_SCOPE
+
+
+def get_scope_version(response_cache, scope):
+    # A version evicted by the cache starts again from the current time,
+    # so that it never matches the entries stored before.
+    return response_cache.get_or_set(
+        SCOPE_VERSION_KEY.format(scope=scope), time.time_ns, None
+    )
+
+
+def bump_scopes(scopes):
+    response_cache = get_response_cache()
+    if response_cache is None:
+        return
+    for scope in scopes:
+        key = SCOPE_VERSION_KEY.format(scope=scope)
+        try:
+            response_cache.incr(key)
+        except ValueError:
+            response_cache.set(key, time.time_ns(), None)
+
+
+def get_contact_ids(instances):
+    """Return the ids of the users whose lists show the instances, before
+    and after their last change."""
+    contact_ids = set()
+    client_ids = set()
+    for instance in instances:
+        for attname in instance.tracked_fields:
+            for value in (
+                instance.__dict__.get(attname),
+                getattr(instance, f'_loaded_{attname}', None),
+            ):
+                if value is None:
+                    continue
+                if attname == 'client_id':
+                    client_ids.add(value)
+                else:
+                    contact_ids.add(value)
+        if isinstance(instance, Client) and instance.pk is not None:
+            client_ids.add(instance.pk)
+
+    # The sales contact of the clients and the support contacts of their
+    # events list the clients with their nested contracts and events.
+    for sales_contact_id, support_contact_id in Client.objects.filter(
+        pk__in=client_ids
+    ).values_list('sales_contact_id', 'events__support_contact_id'):
+        contact_ids.add(sales_contact_id)
+        if support_contact_id is not None:
+            contact_ids.add(support_contact_id)
+    return contact_ids
+
+
+def invalidate_responses(instances):
+    """Invalidate the cached lists showing the instances."""
+    if get_response_cache() is None or not instances:
+        return
+    invalidate_contact_responses(get_contact_ids(instances))
+
+
+def invalidate_contact_responses(contact_ids):
+    """Invalidate the cached lists of the given users, and of the users
+    seeing every object."""
+    if get_response_cache() is None:
+        return
+    scopes = {str(user_id) for user_id in contact_ids}
+    scopes.add(ALL_SCOPE)
+    bump_scopes(scopes)
+    # Again once committed, in case a concurrent request cached the lists
+    # before the transaction was visible.
+    transaction.on_commit(lambda: bump_scopes(scopes))
+
+
+class ResponseCacheMixin:
+    """Cache the list responses per user and query string.
+
+    An entry is invalidated by bumping the version of its scope: the user
+    for the sales and support members, or the scope shared by the users
+    seeing every object. See crm/events/signals.py.
+    """
+
+    def get_response_cache_scope(self, user):
+        """Return the scope of the lists of the user, following the rule
+        of `get_queryset`."""
+        return get_scope(user)
+
+    def get_response_cache_key(self, response_cache, request):
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        version = get_scope_version(
+            response_cache, self.get_response_cache_scope(request.user)
+        )
+        return RESPONSE_CACHE_KEY.format(
+            user_id=request.user.id,
+            version=version,
+            path=request.path,
+            digest=hashlib.md5(query.encode()).hexdigest(),
+        )
+
+    def list(self, request, *args, **kwargs):
+        response_cache = get_response_cache()
+        if response_cache is None:
+            return super().list(request, *args, **kwargs)
+
+        key = self.get_response_cache_key(response_cache, request)
+        entry = response_cache.get(key)
+        if entry is not None:
+            return self.get_cached_response(request, entry)
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            response_cache.set(
+                key,
+                {
+                    'data': response.data,
+                    'headers': {
+                        name: response[name]
+                        for name in ('ETag', 'Last-Modified')
+                        if response.has_header(name)
+                    },
+                },
+            )
+        return response
+
+    def get_cached_response(self, request, entry):
+        headers = entry['headers']
+        response = get_conditional_response(
+            request._request,
+            etag=headers.get('ETag'),
+            last_modified=parse_http_date_safe(headers.get('Last-Modified')),
+        )
+        if response is None:
+            response = Response(entry['data'])
+        for name, value in headers.items():
+            response[name] = value
+        patch_vary_headers(response, ['Authorization'])
+        return response
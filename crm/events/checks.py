@@ -0,0 +1,13 @@
+from django.core.checks import register
+
+from crm.users.checks import check_shared_caches
+
+from .cache import get_response_cache_setting
+
+
+@register()
+def check_response_cache(app_configs, **kwargs):
+    return check_shared_caches(
+        [get_response_cache_setting('ALIAS')],
+        "the scope versions invalidating the cached lists",
+    )
@@ -0,0 +1,120 @@
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .models import aggregate_subquery
+
+
+class ConditionalGetMixin:
+    """Answer `304 Not Modified` to the list and retrieve GETs whose
+    If-None-Match (or If-Modified-Since) still matches.
+
+    The validators come from one aggregate query on the filtered queryset,
+    run before the objects are loaded and serialized: the number of rows
+    and their latest `last_modified`, plus the same for all the rows of
+    the nested relations of `get_conditional_relations()`. The count catches the
+    deletions and the rows entering the scope, which do not move the
+    latest `last_modified`.
+
+    So the ETag is the only validator of the lists and of the objects with
+    nested relations; Last-Modified is only sent for a single object
+    without them. A list whose paginator does not count (`?count=false`,
+    `?pagination=cursor`) gets no validator, so as not to run the count
+    the pagination skipped.
+    """
+
+    # Count of the list, reused by CRMPagination instead of a COUNT(*).
+    conditional_count = None
+
+    def get_conditional_relations(self):
+        """Return the nested relations rendered by the action."""
+        return []
+
+    def get_validators(self, queryset):
+        """Return the count, ETag and Last-Modified timestamp of the
+        objects of the queryset."""
+        # The filters of the queryset may join a relation (the events of
+        # a support member): the objects and each relation are aggregated
+        # in their own subquery on the primary keys, so that the nested
+        # rows are all counted, without a product of the relations.
+        pks = queryset.order_by().values('pk')
+        objects = queryset.model.objects.filter(pk__in=pks)
+        aggregates = {
+            'count': Count('pk'),
+            'last_modified': Max('last_modified'),
+        }
+        for name in self.get_conditional_relations():
+            relation = queryset.model._meta.get_field(name)
+            rows = relation.related_model.objects.filter(
+                **{f'{relation.field.name}__in': pks}
+            )
+            aggregates[f'{name}_count'] = Max(
+                aggregate_subquery(rows, Count('pk'))
+            )
+            aggregates[f'{name}_last_modified'] = Max(
+                aggregate_subquery(rows, Max('last_modified'))
+            )
+        values = objects.aggregate(**aggregates)
+
+        signature = repr([self.request.user.id, *sorted(values.items())])
+        etag = quote_etag(hashlib.md5(signature.encode()).hexdigest())
+        timestamps = [
+            value
+            for name, value in values.items()
+            if name.endswith('last_modified') and value is not None
+        ]
+        last_modified = (
+            int(max(timestamps).timestamp()) if timestamps else None
+        )
+        return values['count'], etag, last_modified
+
+    def get_not_modified_response(self, etag, last_modified):
+        return get_conditional_response(
+            self.request._request, etag=etag, last_modified=last_modified
+        )
+
+    def set_validators(self, response, etag, last_modified):
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            patch_vary_headers(response, ['Authorization'])
+        return response
+
+    def paginator_counts(self):
+        paginator = self.paginator
+        counts = getattr(paginator, 'counts', None)
+        return counts is None or counts(self.request)
+
+    def list(self, request, *args, **kwargs):
+        if not self.paginator_counts():
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        count, etag, last_modified = self.get_validators(queryset)
+        response = self.get_not_modified_response(etag, None)
+        if response is None:
+            self.conditional_count = count
+            response = super().list(request, *args, **kwargs)
+        return self.set_validators(response, etag, None)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            queryset = self.filter_queryset(self.get_queryset()).filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+            count, etag, last_modified = self.get_validators(queryset)
+        except (TypeError, ValueError, ValidationError):
+            # An invalid lookup is left to the 404 of get_object.
+            return super().retrieve(request, *args, **kwargs)
+        if self.get_conditional_relations():
+            last_modified = None
+        response = None
+        if count:
+            response = self.get_not_modified_response(etag, last_modified)
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+        return self.set_validators(response, etag, last_modified)
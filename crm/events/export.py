@@ -0,0 +1,83 @@
+import csv
+import json
+from itertools import chain, islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """File-like object returning what is written, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def csv_rows(fields, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def ndjson_rows(fields, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(fields, row)), cls=DjangoJSONEncoder) + '\n'
+
+
+class ExportMixin:
+    """`export` action streaming the filtered list as CSV or NDJSON.
+
+    The rows are read as tuples from a server-side cursor (`iterator()`)
+    and written as they come, so the memory does not grow with the number
+    of rows. The format is chosen with `?file_format=csv|ndjson`, as
+    `?format=` is the content negotiation of the API.
+    """
+
+    export_formats = {
+        'csv': ('text/csv', csv_rows),
+        'ndjson': ('application/x-ndjson', ndjson_rows),
+    }
+    export_filename = 'export'
+
+    def get_export_fields(self):
+        return list(self.get_serializer_class().Meta.fields)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        file_format = request.query_params.get('file_format', 'csv')
+        if file_format not in self.export_formats:
+            return Response(
+                {
+                    'message': "Unknown file_format, expected one of: "
+                    + ", ".join(self.export_formats)
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        content_type, render = self.export_formats[file_format]
+
+        fields = self.get_export_fields()
+        queryset = self.filter_queryset(self.get_queryset())
+        # The rows are streamed once dispatch returned: the database is
+        # chosen now, while the request reads from the replicas, and the
+        # query is run now, to be profiled with the request and to fail
+        # with a 500 instead of a truncated file.
+        rows = (
+            queryset.using(queryset.db)
+            .order_by('pk')
+            .values_list(*fields)
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+        first_rows = list(islice(rows, 1))
+        response = StreamingHttpResponse(
+            render(fields, chain(first_rows, rows)), content_type=content_type
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{self.export_filename}.{file_format}"'
+        )
+        return response
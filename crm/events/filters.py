@@ -1,4 +1,5 @@
 import django_filters
+from rest_framework.filters import SearchFilter
 from .models import Contract
 
 
@@ -14,3 +15,13 @@ class ContractFilter(django_filters.FilterSet):
     class Meta:
         model = Contract
         fields = ['date_created', 'amount', 'client']
+
+
+class ClientSearchFilter(SearchFilter):
+    """Search on the name and email of the client with ?q=.
+
+    The icontains lookups are backed by the pg_trgm indexes
+    of the 0012 migration.
+    """
+
+    search_param = 'q'
@@ -0,0 +1,83 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from crm.events.models import SalesSummary
+
+
+def get_sales_user_ids():
+    """Return the ids of the users having a summary, sorted."""
+    return list(
+        SalesSummary.get_sales_users()
+        .order_by('pk')
+        .values_list('pk', flat=True)
+    )
+
+
+def get_stale_summaries():
+    """Return the summaries of the users who left the sales group."""
+    return SalesSummary.objects.exclude(
+        sales_contact__in=SalesSummary.get_sales_users()
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the sales summaries in batches, or check that the stored "
+        "summaries match the clients, contracts and events."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help="Report the out of date summaries without changing them.",
+        )
+
+    def handle(self, *args, **options):
+        user_ids = get_sales_user_ids()
+        batch_size = options['batch_size']
+        batches = [
+            user_ids[start : start + batch_size]
+            for start in range(0, len(user_ids), batch_size)
+        ]
+        if options['verify']:
+            self.verify(batches)
+            return
+        get_stale_summaries().delete()
+        for batch in batches:
+            with transaction.atomic():
+                SalesSummary.refresh(batch)
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {len(user_ids)} sales summaries.")
+        )
+
+    def verify(self, batches):
+        mismatches = 0
+        for user_id in get_stale_summaries().values_list(
+            'sales_contact', flat=True
+        ):
+            mismatches += 1
+            self.stdout.write(f"user {user_id}: not a sales user")
+        for batch in batches:
+            stored = SalesSummary.objects.in_bulk(batch)
+            for summary in SalesSummary.compute(batch):
+                user_id = summary.sales_contact_id
+                if user_id not in stored:
+                    mismatches += 1
+                    self.stdout.write(f"user {user_id}: no summary")
+                    continue
+                stored_figures = stored[user_id].get_figures()
+                for name, value in summary.get_figures().items():
+                    if stored_figures[name] != value:
+                        mismatches += 1
+                        self.stdout.write(
+                            f"user {user_id}: {name} is "
+                            f"{stored_figures[name]}, expected {value}"
+                        )
+        if mismatches:
+            raise CommandError(
+                f"{mismatches} out of date summaries or figures, run the command "
+                "without --verify to rebuild the summaries."
+            )
+        self.stdout.write(self.style.SUCCESS("The sales summaries match."))
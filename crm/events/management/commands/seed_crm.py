@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from crm.events.seeding import get_volumes, seed, unseed
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the database with deterministic users, clients, contracts "
+        "and events."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale',
+            type=float,
+            default=0.01,
+            help="1 creates 10k clients and 100k contracts and events.",
+        )
+        parser.add_argument('--seed', type=int, default=12)
+        parser.add_argument(
+            '--password',
+            default="crm1111",
+            help="Password of every seeded user.",
+        )
+        parser.add_argument('--prefix', default="seed_")
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help="Delete the previously seeded data first.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options['clear']:
+                unseed(options['prefix'])
+            seed(
+                scale=options['scale'],
+                seed=options['seed'],
+                password=options['password'],
+                prefix=options['prefix'],
+            )
+        volumes = get_volumes(options['scale'])
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Seeded {sales} sales and {support} support users, "
+                "{clients} clients, {contracts} contracts "
+                "and {events} events.".format(**volumes)
+            )
+        )
@@ -0,0 +1,58 @@
+# Generated by Django 4.1.7 on 2026-10-18 00:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0010_alter_eventstatus_options"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="client",
+            index=models.Index(fields=["email"], name="client_email_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="client",
+            index=models.Index(fields=["last_name"], name="client_last_name_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="client",
+            index=models.Index(
+                fields=["sales_contact", "date_created"],
+                name="client_sales_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="contract",
+            index=models.Index(
+                fields=["client", "signed_status"], name="contract_client_signed_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="contract",
+            index=models.Index(
+                condition=models.Q(("signed_status", True)),
+                fields=["client"],
+                name="contract_signed_client_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="contract",
+            index=models.Index(
+                fields=["sales_contact", "date_created"],
+                name="contract_sales_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(fields=["event_date"], name="event_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["support_contact", "event_date"], name="event_support_date_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.1.7 on 2026-10-18 00:14
+
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef
+
+
+def fill_has_active_contract(apps, schema_editor):
+    Client = apps.get_model("events", "Client")
+    Contract = apps.get_model("events", "Contract")
+    signed_contracts = Contract.objects.filter(
+        client=OuterRef("pk"), signed_status=True
+    )
+    Client.objects.update(has_active_contract=Exists(signed_contracts))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0012_client_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="client",
+            name="has_active_contract",
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(fill_has_active_contract, migrations.RunPython.noop),
+    ]
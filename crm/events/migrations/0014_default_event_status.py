@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+def create_default_event_status(apps, schema_editor):
+    EventStatus = apps.get_model("events", "EventStatus")
+    EventStatus.objects.get_or_create(status=False)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0013_client_has_active_contract"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_default_event_status, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.1.7 on 2026-10-18 00:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0014_default_event_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="client",
+            name="last_modified",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="contract",
+            name="last_modified",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="last_modified",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.1.7 on 2026-10-18 00:49
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0001_initial"),
+        ("events", "0015_last_modified"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SalesSummary",
+            fields=[
+                (
+                    "sales_contact",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="sales_summary",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("client_count", models.PositiveIntegerField(default=0)),
+                ("open_contract_count", models.PositiveIntegerField(default=0)),
+                ("open_contract_amount", models.FloatField(default=0)),
+                ("signed_contract_count", models.PositiveIntegerField(default=0)),
+                ("signed_contract_amount", models.FloatField(default=0)),
+                ("overdue_contract_count", models.PositiveIntegerField(default=0)),
+                ("next_event_date", models.DateField(null=True)),
+                ("computed_on", models.DateField()),
+            ],
+            options={
+                "verbose_name_plural": "Sales summaries",
+            },
+        ),
+    ]
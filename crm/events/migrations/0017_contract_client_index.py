@@ -0,0 +1,27 @@
+# Generated by Django 4.1.7 on 2026-10-18 01:01
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0016_sales_summary"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="contract",
+            name="contract_signed_client_idx",
+        ),
+        migrations.AlterField(
+            model_name="contract",
+            name="client",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="contracts",
+                to="events.client",
+            ),
+        ),
+    ]
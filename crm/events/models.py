@@ -1,8 +1,50 @@
-from django.db import models
+from datetime import date
+from functools import partial
+
+from django.db import connections, models, router, transaction
+from django.db.models import (
+    Count,
+    Exists,
+    Min,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+)
 from django.conf import settings
+from django.utils import timezone
+
+from crm.users.roles import SALES
+
+
+class TrackedModel(models.Model):
+    """Model remembering the value of its `tracked_fields` as loaded from
+    the database (`_loaded_<attname>`), to also refresh what the object
+    was related to before a change."""
+
+    tracked_fields = ()
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.track_loaded_values()
+        return instance
+
+    def track_loaded_values(self):
+        for attname in self.tracked_fields:
+            setattr(self, f'_loaded_{attname}', self.__dict__.get(attname))
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # After the post_save receivers, which read the previous values.
+        self.track_loaded_values()
 
 
-class Client(models.Model):
+class Client(TrackedModel):
     first_name = models.CharField(max_length=25, blank=False)
     last_name = models.CharField(max_length=25, blank=False)
     email = models.CharField(max_length=100, blank=False)
@@ -11,46 +53,117 @@ class Client(models.Model):
     company_name = models.CharField(max_length=250, blank=False)
     date_created = models.DateField(auto_now_add=True, blank=False)
     date_updated = models.DateField(auto_now_add=True, blank=False)
+    # Validator of the conditional GETs, see conditional.py
+    last_modified = models.DateTimeField(auto_now=True)
     sales_contact = models.ForeignKey(
         to=settings.AUTH_USER_MODEL, on_delete=models.CASCADE, blank=False
     )
+    # Kept up to date by the Contract signals, see signals.py
+    has_active_contract = models.BooleanField(default=False, editable=False)
 
+    tracked_fields = ('sales_contact_id',)
 
-class Contract(models.Model):
+    @classmethod
+    def refresh_active_contract(cls, client_ids):
+        """Recompute the active contract flag of the given clients."""
+        signed_contracts = Contract.objects.filter(
+            client=OuterRef('pk'), signed_status=True
+        )
+        # The nested contracts of the clients changed as well.
+        cls.objects.filter(pk__in=client_ids).update(
+            has_active_contract=Exists(signed_contracts),
+            last_modified=timezone.now(),
+        )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['email'], name='client_email_idx'),
+            models.Index(fields=['last_name'], name='client_last_name_idx'),
+            models.Index(
+                fields=['sales_contact', 'date_created'],
+                name='client_sales_created_idx',
+            ),
+        ]
+
+
+class Contract(TrackedModel):
     sales_contact = models.ForeignKey(
         to=settings.AUTH_USER_MODEL, on_delete=models.CASCADE, blank=False
     )
+    # Indexed by contract_client_signed_idx, which leads with the client.
     client = models.ForeignKey(
         to=Client,
         on_delete=models.CASCADE,
         related_name='contracts',
         blank=False,
+        db_index=False,
     )
     date_created = models.DateField(auto_now_add=True, blank=False)
     date_updated = models.DateField(auto_now_add=True, blank=False)
+    # Validator of the conditional GETs, see conditional.py
+    last_modified = models.DateTimeField(auto_now=True)
     signed_status = models.BooleanField(default=False)
     amount = models.FloatField(blank=False)
     payment_due = models.DateField(blank=False)
 
+    tracked_fields = ('client_id', 'sales_contact_id')
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['client', 'signed_status'],
+                name='contract_client_signed_idx',
+            ),
+            models.Index(
+                fields=['sales_contact', 'date_created'],
+                name='contract_sales_created_idx',
+            ),
+        ]
+
 
 class EventStatus(models.Model):
     status = models.BooleanField(default=False, unique=True)
 
+    # Resolved once per process, reset after a migrate or a flush and when
+    # the default row is deleted (see signals.py).
+    _default_pk = None
+
     @classmethod
     def get_default_pk(cls):
+        """Return the pk of the default status, created by a migration."""
+        if cls._default_pk is not None:
+            return cls._default_pk
         event_status, created = cls.objects.get_or_create(status=False)
+        if created:
+            # Remembered once committed: after a rollback, the pk would be
+            # the one of a missing row.
+            transaction.on_commit(partial(cls.set_default_pk, event_status.pk))
+        else:
+            cls.set_default_pk(event_status.pk)
         return event_status.pk
 
+    @classmethod
+    def set_default_pk(cls, pk):
+        cls._default_pk = pk
+
+    @classmethod
+    def clear_default_pk(cls, pk=None):
+        """Forget the default status, or only if its pk is the given one."""
+        if pk is None or pk == cls._default_pk:
+            cls._default_pk = None
+
     class Meta:
         verbose_name_plural = 'Event status'
 
 
-class Event(models.Model):
+class Event(TrackedModel):
     client = models.ForeignKey(
         to=Client, on_delete=models.CASCADE, related_name='events', blank=False
     )
     date_created = models.DateField(auto_now_add=True, blank=False)
     date_updated = models.DateField(auto_now_add=True, blank=False)
+    # Validator of the conditional GETs, see conditional.py
+    last_modified = models.DateTimeField(auto_now=True)
     support_contact = models.ForeignKey(
         to=settings.AUTH_USER_MODEL, on_delete=models.CASCADE, blank=False
     )
@@ -62,3 +175,173 @@ class Event(models.Model):
     attendees = models.IntegerField(blank=False)
     event_date = models.DateField(blank=False)
     notes = models.CharField(max_length=400, blank=True)
+
+    tracked_fields = ('client_id', 'support_contact_id')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['event_date'], name='event_date_idx'),
+            models.Index(
+                fields=['support_contact', 'event_date'],
+                name='event_support_date_idx',
+            ),
+        ]
+
+
+def aggregate_subquery(queryset, aggregate):
+    """Return a subquery of the aggregate over all the rows of the
+    queryset (no GROUP BY, so there is always one row)."""
+    return Subquery(
+        queryset.order_by()
+        .annotate(group=Value(1))
+        .values('group')
+        .annotate(value=aggregate)
+        .values('value')
+    )
+
+
+# Key space of the advisory locks of the sales summaries ("SALS"), the user
+# id being the low 32 bits of a key. See SalesSummary.lock.
+SUMMARY_LOCK_NAMESPACE = 0x53414C53
+
+
+class SalesSummary(models.Model):
+    """Dashboard figures of a sales contact, kept up to date by the Client,
+    Contract and Event signals (see signals.py) and rebuilt by the
+    `sales_summaries` command.
+
+    Only the members of the sales group have a summary. The open contracts
+    are the unsigned ones, the overdue contracts the open ones past their
+    payment_due. The next event date and the overdue count depend on the
+    day: a summary computed on an earlier day is computed again when read.
+    """
+
+    sales_contact = models.OneToOneField(
+        to=settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='sales_summary',
+    )
+    client_count = models.PositiveIntegerField(default=0)
+    open_contract_count = models.PositiveIntegerField(default=0)
+    open_contract_amount = models.FloatField(default=0)
+    signed_contract_count = models.PositiveIntegerField(default=0)
+    signed_contract_amount = models.FloatField(default=0)
+    overdue_contract_count = models.PositiveIntegerField(default=0)
+    next_event_date = models.DateField(null=True)
+    computed_on = models.DateField()
+
+    figure_fields = (
+        'client_count',
+        'open_contract_count',
+        'open_contract_amount',
+        'signed_contract_count',
+        'signed_contract_amount',
+        'overdue_contract_count',
+        'next_event_date',
+    )
+
+    class Meta:
+        verbose_name_plural = 'Sales summaries'
+
+    @classmethod
+    def compute(cls, user_ids):
+        """Return unsaved summaries of the given sales users, in one query.
+
+        The figures are correlated subqueries of the users, so that
+        a missing (e.g. deleted) user, or one who is not in the sales
+        group, has no summary.
+        """
+        today = date.today()
+        open_contracts = Q(signed_status=False)
+        signed_contracts = Q(signed_status=True)
+        clients = Client.objects.filter(sales_contact=OuterRef('pk'))
+        contracts = Contract.objects.filter(sales_contact=OuterRef('pk'))
+        events = Event.objects.filter(
+            client__sales_contact=OuterRef('pk'), event_date__gte=today
+        )
+        rows = (
+            cls.get_sales_users()
+            .filter(pk__in=user_ids)
+            .annotate(
+                client_count=aggregate_subquery(clients, Count('id')),
+                open_contract_count=aggregate_subquery(
+                    contracts, Count('id', filter=open_contracts)
+                ),
+                open_contract_amount=aggregate_subquery(
+                    contracts,
+                    Sum('amount', filter=open_contracts, default=0.0),
+                ),
+                signed_contract_count=aggregate_subquery(
+                    contracts, Count('id', filter=signed_contracts)
+                ),
+                signed_contract_amount=aggregate_subquery(
+                    contracts,
+                    Sum('amount', filter=signed_contracts, default=0.0),
+                ),
+                overdue_contract_count=aggregate_subquery(
+                    contracts,
+                    Count(
+                        'id', filter=open_contracts & Q(payment_due__lt=today)
+                    ),
+                ),
+                next_event_date=aggregate_subquery(events, Min('event_date')),
+            )
+            .values('pk', *cls.figure_fields)
+        )
+        return [
+            cls(sales_contact_id=row.pop('pk'), computed_on=today, **row)
+            for row in rows
+        ]
+
+    @classmethod
+    def get_sales_users(cls):
+        """Return the users having a summary: the members of the sales
+        group."""
+        User = cls._meta.get_field('sales_contact').related_model
+        return User.objects.filter(groups__name=SALES)
+
+    @classmethod
+    def lock(cls, user_ids):
+        """Lock the summaries of the given users until the end of the
+        transaction, with PostgreSQL advisory locks: the users' rows (also
+        written by the logins) are left alone. SQLite runs one writing
+        transaction at a time anyway."""
+        connection = connections[router.db_for_write(cls)]
+        if connection.vendor != 'postgresql':
+            return
+        keys = sorted(
+            (SUMMARY_LOCK_NAMESPACE << 32) | user_id for user_id in user_ids
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT pg_advisory_xact_lock(key) '
+                'FROM unnest(%s::bigint[]) AS key ORDER BY key',
+                [keys],
+            )
+
+    @classmethod
+    def refresh(cls, user_ids):
+        """Compute and store the summaries of the given users.
+
+        The summaries are locked first, until the end of the transaction:
+        the refreshes of a user run one after the other, and each one
+        computes the figures in a later query, which (under READ COMMITTED)
+        sees the writes committed by the previous one.
+        """
+        user_ids = {user_id for user_id in user_ids if user_id is not None}
+        if not user_ids:
+            return []
+        with transaction.atomic(savepoint=False):
+            cls.lock(user_ids)
+            summaries = cls.compute(user_ids)
+            cls.objects.bulk_create(
+                summaries,
+                update_conflicts=True,
+                unique_fields=['sales_contact'],
+                update_fields=[*cls.figure_fields, 'computed_on'],
+            )
+        return summaries
+
+    def get_figures(self):
+        return {name: getattr(self, name) for name in self.figure_fields}
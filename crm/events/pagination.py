@@ -0,0 +1,241 @@
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+from urllib import parse
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination,
+    LimitOffsetPagination,
+    _positive_int,
+)
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from crm.metrics import PAGINATION_OFFSET
+
+DEFAULT_KEYSET_ORDERING = ('-date_created', '-id')
+
+
+def get_pagination_setting(name):
+    defaults = {
+        'CURSOR_PAGE_SIZE': 4,
+        'MAX_PAGE_SIZE': 100,
+    }
+    return getattr(settings, 'CRM_PAGINATION', {}).get(name, defaults[name])
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination on a (field, id) pair.
+
+    Each page is fetched with a `WHERE (field, id) < (value, pk)` filter
+    instead of an offset, so deep pages cost the same as the first one
+    and no `COUNT(*)` is run.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, ordering=DEFAULT_KEYSET_ORDERING):
+        field, pk_field = ordering
+        self.descending = field.startswith('-')
+        assert self.descending == pk_field.startswith('-'), (
+            'Keyset pagination requires both ordering fields '
+            'to have the same direction.'
+        )
+        self.field = field.lstrip('-')
+        self.pk_field = pk_field.lstrip('-')
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=get_pagination_setting('MAX_PAGE_SIZE'),
+            )
+        except (KeyError, ValueError):
+            return get_pagination_setting('CURSOR_PAGE_SIZE')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request, queryset.model)
+        reverse = cursor is not None and cursor['reverse']
+
+        # Going backwards means walking the index the other way round.
+        descending = self.descending != reverse
+        if cursor is not None:
+            lookup = 'lt' if descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__{lookup}': cursor['position']})
+                | Q(
+                    **{
+                        self.field: cursor['position'],
+                        f'{self.pk_field}__{lookup}': cursor['pk'],
+                    }
+                )
+            )
+        prefix = '-' if descending else ''
+        queryset = queryset.order_by(
+            f'{prefix}{self.field}', f'{prefix}{self.pk_field}'
+        )
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+        return self.page
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        # The position is parsed like the field, so that a crafted one is
+        # an invalid cursor rather than an error of the filter.
+        field = model._meta.get_field(self.field)
+        pk_field = model._meta.get_field(self.pk_field)
+        try:
+            querystring = b64decode(encoded.encode('ascii')).decode('ascii')
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            return {
+                'position': field.to_python(tokens['p'][0]),
+                'pk': pk_field.to_python(tokens['o'][0]),
+                'reverse': bool(int(tokens.get('r', ['0'])[0])),
+            }
+        except (
+            TypeError,
+            ValueError,
+            KeyError,
+            UnicodeError,
+            ValidationError,
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, instance, reverse):
+        tokens = {
+            'p': str(getattr(instance, self.field)),
+            'o': getattr(instance, self.pk_field),
+        }
+        if reverse:
+            tokens['r'] = '1'
+        querystring = parse.urlencode(tokens, doseq=True)
+        encoded = b64encode(querystring.encode('ascii')).decode('ascii')
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            url = self.request.build_absolute_uri()
+            return remove_query_param(url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ('next', self.get_next_link()),
+                    ('previous', self.get_previous_link()),
+                    ('results', data),
+                ]
+            )
+        )
+
+
+class CRMPagination(LimitOffsetPagination):
+    """Limit/offset pagination with two opt-in modes.
+
+    - `?pagination=cursor` (or any `?cursor=`) switches to keyset
+      pagination on the view's `keyset_ordering`.
+    - `?count=false` skips the `COUNT(*)` of the limit/offset mode.
+    """
+
+    mode_query_param = 'pagination'
+    count_query_param = 'count'
+
+    keyset = None
+    known_count = None
+
+    def use_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or KeysetPagination.cursor_query_param in request.query_params
+        )
+
+    def use_count(self, request):
+        value = request.query_params.get(self.count_query_param, 'true')
+        return value.lower() not in ('false', '0', 'no')
+
+    def counts(self, request):
+        """Return whether the page of the request comes with a count."""
+        return not self.use_keyset(request) and self.use_count(request)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_keyset(request):
+            ordering = getattr(
+                view, 'keyset_ordering', DEFAULT_KEYSET_ORDERING
+            )
+            self.keyset = KeysetPagination(ordering)
+            return self.keyset.paginate_queryset(queryset, request, view)
+        PAGINATION_OFFSET.observe(
+            self.get_offset(request), view=type(view).__name__
+        )
+        if self.use_count(request):
+            self.known_count = getattr(view, 'conditional_count', None)
+            return super().paginate_queryset(queryset, request, view)
+
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+        self.request = request
+        self.count = None
+        results = list(queryset[self.offset : self.offset + self.limit + 1])
+        self.has_next = len(results) > self.limit
+        return results[: self.limit]
+
+    def get_count(self, queryset):
+        # Counted by ConditionalGetMixin with the validators of the list.
+        if self.known_count is not None:
+            return self.known_count
+        return super().get_count(queryset)
+
+    def get_next_link(self):
+        if self.count is None:
+            if not self.has_next:
+                return None
+            url = self.request.build_absolute_uri()
+            url = replace_query_param(url, self.limit_query_param, self.limit)
+            offset = self.offset + self.limit
+            return replace_query_param(url, self.offset_query_param, offset)
+        return super().get_next_link()
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        if self.count is None:
+            return Response(
+                OrderedDict(
+                    [
+                        ('next', self.get_next_link()),
+                        ('previous', self.get_previous_link()),
+                        ('results', data),
+                    ]
+                )
+            )
+        return super().get_paginated_response(data)
@@ -12,14 +12,11 @@ class IsSalesContact(BasePermission):
         return bool(request.user and request.user.is_authenticated)
 
     def has_object_permission(self, request, view, obj):
+        # Compare the ids to avoid loading the related users.
         if isinstance(obj, Contract) or isinstance(obj, Client):
-            if obj.sales_contact == request.user:
-                return True
-            return False
+            return obj.sales_contact_id == request.user.id
         elif isinstance(obj, Event):
-            if obj.client.sales_contact == request.user:
-                return True
-            return False
+            return obj.client.sales_contact_id == request.user.id
 
 
 class IsSupportContact(BasePermission):
@@ -32,9 +29,7 @@ class IsSupportContact(BasePermission):
         return bool(request.user and request.user.is_authenticated)
 
     def has_object_permission(self, request, view, obj):
-        if obj.support_contact == request.user:
-            return True
-        return False
+        return obj.support_contact_id == request.user.id
 
 
 class HasActiveContract(BasePermission):
@@ -49,9 +44,4 @@ class HasActiveContract(BasePermission):
         return bool(request.user and request.user.is_authenticated)
 
     def has_object_permission(self, request, view, obj):
-        active_contract = Contract.objects.filter(
-            client=obj, signed_status=True
-        )
-        if active_contract:
-            return True
-        return False
+        return obj.has_active_contract
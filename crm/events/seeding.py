@@ -0,0 +1,179 @@
+import random
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, Permission
+from django.db import transaction
+from django.db.models import Q
+
+from crm.users.models import User
+from crm.users.roles import SALES, SUPPORT
+
+from .cache import invalidate_contact_responses
+from .models import Client, Contract, Event, SalesSummary
+
+# Number of rows at scale 1
+VOLUMES = {
+    'sales': 100,
+    'support': 100,
+    'clients': 10000,
+    'contracts': 100000,
+    'events': 100000,
+}
+
+GROUP_PERMISSIONS = {
+    SALES: [
+        'add_client',
+        'view_client',
+        'change_client',
+        'add_contract',
+        'change_contract',
+        'add_event',
+        'change_event',
+    ],
+    SUPPORT: [
+        'view_client',
+        'view_contract',
+        'view_event',
+        'change_event',
+    ],
+}
+
+BATCH_SIZE = 5000
+
+
+def get_volumes(scale):
+    return {
+        name: max(2, int(volume * scale)) for name, volume in VOLUMES.items()
+    }
+
+
+def get_group(name):
+    """Return the group with its permissions, added in a single query."""
+    group, created = Group.objects.get_or_create(name=name)
+    group.permissions.add(
+        *Permission.objects.filter(codename__in=GROUP_PERMISSIONS[name])
+    )
+    return group
+
+
+def create_users(prefix, number, group, password):
+    """Create the users of a group, hashing the password only once."""
+    encoded_password = make_password(password)
+    users = User.objects.bulk_create(
+        User(username=f"{prefix}{i}", password=encoded_password)
+        for i in range(number)
+    )
+    group.user_set.add(*users)
+    return users
+
+
+def seed(scale=0.01, seed=12, password="crm1111", prefix="seed_"):
+    """Create users, clients, contracts and events with bulk_create.
+
+    The data is the same for a given scale and seed. At scale 1 there are
+    10k clients and 100k contracts and events.
+    """
+    rng = random.Random(seed)
+    volumes = get_volumes(scale)
+    today = date.today()
+
+    sales = create_users(
+        f"{prefix}sales", volumes['sales'], get_group(SALES), password
+    )
+    support = create_users(
+        f"{prefix}support", volumes['support'], get_group(SUPPORT), password
+    )
+
+    clients = Client.objects.bulk_create(
+        (
+            Client(
+                sales_contact=sales[i % len(sales)],
+                first_name=f"first{i}",
+                last_name=f"last{i}",
+                email=f"client{i}@{prefix.strip('_')}.test",
+                phone="0222222222",
+                mobile="0622222222",
+                company_name=f"company {i}",
+                has_active_contract=True,
+            )
+            for i in range(volumes['clients'])
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+    contracts = []
+    for i in range(volumes['contracts']):
+        client = clients[i % len(clients)]
+        contracts.append(
+            Contract(
+                sales_contact=client.sales_contact,
+                client=client,
+                # Every client gets at least one signed contract.
+                signed_status=i < len(clients) or rng.random() < 0.5,
+                amount=round(rng.uniform(100, 100000), 2),
+                payment_due=today + timedelta(days=rng.randint(-90, 365)),
+            )
+        )
+    Contract.objects.bulk_create(contracts, batch_size=BATCH_SIZE)
+
+    Event.objects.bulk_create(
+        (
+            Event(
+                client=rng.choice(clients),
+                support_contact=rng.choice(support),
+                attendees=rng.randint(10, 1000),
+                event_date=today + timedelta(days=rng.randint(-90, 365)),
+                notes="seed",
+            )
+            for i in range(volumes['events'])
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    return {'sales': sales, 'support': support, 'clients': clients}
+
+
+def unseed(prefix="seed_"):
+    """Delete the seeded users with their clients, contracts and events.
+
+    The rows are deleted in bulk, children first, without the delete
+    receivers of each row (queries per row, hundreds of thousands at
+    scale 1). The active contract flags, cached lists and summaries of
+    the other users are then refreshed once.
+    """
+    users = User.objects.filter(username__startswith=prefix)
+    user_ids = users.values('pk')
+    events = Event.objects.filter(
+        Q(client__sales_contact__in=user_ids) | Q(support_contact__in=user_ids)
+    )
+    contracts = Contract.objects.filter(
+        Q(client__sales_contact__in=user_ids) | Q(sales_contact__in=user_ids)
+    )
+    clients = Client.objects.filter(sales_contact__in=user_ids)
+
+    # The other rows showing or counting the deleted ones.
+    client_ids = set(
+        contracts.exclude(client__in=clients).values_list(
+            'client_id', flat=True
+        )
+    )
+    sales_contact_ids = set()
+    support_contact_ids = set()
+    for queryset, sales_fields, support_fields in (
+        (events, ['client__sales_contact'], ['support_contact']),
+        (contracts, ['client__sales_contact', 'sales_contact'], []),
+    ):
+        fields = [*sales_fields, *support_fields]
+        for row in queryset.order_by().values_list(*fields).distinct():
+            sales_contact_ids.update(row[: len(sales_fields)])
+            support_contact_ids.update(row[len(sales_fields) :])
+    sales_contact_ids.discard(None)
+
+    with transaction.atomic():
+        for queryset in (events, contracts, clients):
+            queryset._raw_delete(queryset.db)
+        users.delete()
+        Client.refresh_active_contract(client_ids)
+        invalidate_contact_responses(sales_contact_ids | support_contact_ids)
+        # The deleted users have no summary left to refresh.
+        SalesSummary.refresh(sales_contact_ids)
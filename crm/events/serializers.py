@@ -1,10 +1,51 @@
 from rest_framework import serializers
-from .models import Client, Event, Contract
+from .bulk import BulkListSerializer, PrefetchedPrimaryKeyRelatedField
+from .models import Client, Event, Contract, SalesSummary
+
+
+class EventSerializer(serializers.ModelSerializer):
+    serializer_related_field = PrefetchedPrimaryKeyRelatedField
+
+    class Meta:
+        model = Event
+        list_serializer_class = BulkListSerializer
+        fields = [
+            'id',
+            'client',
+            'date_created',
+            'date_updated',
+            'support_contact',
+            'event_status',
+            'attendees',
+            'event_date',
+            'notes',
+        ]
+
+
+class ContractSerializer(serializers.ModelSerializer):
+    serializer_related_field = PrefetchedPrimaryKeyRelatedField
+
+    class Meta:
+        model = Contract
+        list_serializer_class = BulkListSerializer
+        fields = [
+            'id',
+            'sales_contact',
+            'client',
+            'date_created',
+            'date_updated',
+            'signed_status',
+            'amount',
+            'payment_due',
+        ]
 
 
 class ClientListSerializer(serializers.ModelSerializer):
+    serializer_related_field = PrefetchedPrimaryKeyRelatedField
+
     class Meta:
         model = Client
+        list_serializer_class = BulkListSerializer
         fields = [
             'id',
             'first_name',
@@ -18,8 +59,22 @@ class ClientListSerializer(serializers.ModelSerializer):
             'sales_contact',
         ]
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        expandable_fields = {
+            'events': EventSerializer,
+            'contracts': ContractSerializer,
+        }
+        for field_name in self.context.get('expand', ()):
+            self.fields[field_name] = expandable_fields[field_name](
+                many=True, read_only=True
+            )
+
 
 class ClientDetailSerializer(serializers.ModelSerializer):
+    events = EventSerializer(many=True, read_only=True)
+    contracts = ContractSerializer(many=True, read_only=True)
+
     class Meta:
         model = Client
         fields = [
@@ -37,49 +92,8 @@ class ClientDetailSerializer(serializers.ModelSerializer):
             'contracts',
         ]
 
-        def get_events(self, instance):
 
-            queryset = instance.events.all()
-
-            serializer = EventSerializer(queryset, many=True)
-
-            return serializer.data
-
-        def get_contracts(self, instance):
-
-            queryset = instance.contracts.all()
-
-            serializer = ContractSerializer(queryset, many=True)
-
-            return serializer.data
-
-
-class EventSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Event
-        fields = [
-            'id',
-            'client',
-            'date_created',
-            'date_updated',
-            'support_contact',
-            'event_status',
-            'attendees',
-            'event_date',
-            'notes',
-        ]
-
-
-class ContractSerializer(serializers.ModelSerializer):
+class SalesSummarySerializer(serializers.ModelSerializer):
     class Meta:
-        model = Contract
-        fields = [
-            'id',
-            'sales_contact',
-            'client',
-            'date_created',
-            'date_updated',
-            'signed_status',
-            'amount',
-            'payment_due',
-        ]
+        model = SalesSummary
+        fields = ['sales_contact', *SalesSummary.figure_fields, 'computed_on']
@@ -0,0 +1,69 @@
+from django.db.models.signals import (
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+
+from .cache import invalidate_responses
+from .models import Client, Contract, Event, EventStatus
+from .summary import refresh_summaries, refresh_summaries_on_commit
+
+
+@receiver(post_save, sender=Contract)
+@receiver(post_delete, sender=Contract)
+def refresh_client_active_contract(sender, instance, **kwargs):
+    """Keep Client.has_active_contract in sync with its signed contracts."""
+    client_ids = {instance.client_id}
+    loaded_client_id = getattr(instance, '_loaded_client_id', None)
+    if loaded_client_id is not None:
+        client_ids.add(loaded_client_id)
+    Client.refresh_active_contract(client_ids)
+
+
+@receiver(post_save, sender=Client)
+@receiver(post_save, sender=Contract)
+@receiver(post_save, sender=Event)
+@receiver(pre_delete, sender=Client)
+@receiver(pre_delete, sender=Contract)
+@receiver(pre_delete, sender=Event)
+def invalidate_cached_responses(sender, instance, **kwargs):
+    """Invalidate the cached lists of the users seeing the instance.
+
+    On pre_delete, as the related rows are gone after a cascade delete.
+    """
+    invalidate_responses([instance])
+
+
+@receiver(post_save, sender=Client)
+@receiver(post_save, sender=Contract)
+@receiver(post_save, sender=Event)
+def refresh_sales_summaries(sender, instance, **kwargs):
+    """Recompute the summaries of the sales contacts of the instance."""
+    refresh_summaries([instance])
+
+
+@receiver(pre_delete, sender=Client)
+@receiver(pre_delete, sender=Contract)
+@receiver(pre_delete, sender=Event)
+def refresh_deleted_sales_summaries(
+    sender, instance, using=None, origin=None, **kwargs
+):
+    """Collect the sales contacts while the related rows are still there,
+    and recompute their summaries once the delete is committed."""
+    refresh_summaries_on_commit(instance, origin or instance, using)
+
+
+@receiver(post_migrate)
+def clear_default_event_status(sender, **kwargs):
+    """The default status row may have been recreated by a migrate
+    or a flush (which also sends post_migrate)."""
+    EventStatus.clear_default_pk()
+
+
+@receiver(post_delete, sender=EventStatus)
+def clear_deleted_default_event_status(sender, instance, **kwargs):
+    """The default status row may be deleted, e.g. in the admin: the next
+    event creates it again."""
+    EventStatus.clear_default_pk(instance.pk)
@@ -0,0 +1,128 @@
+import logging
+from collections import defaultdict
+from datetime import date
+
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from .cache import get_response_cache, get_scope_version
+from .views import ContractViewset, EventViewset
+
+logger = logging.getLogger(__name__)
+
+STATS_CACHE_KEY = 'crm:stats:{user_id}:v{contracts_version}:v{events_version}'
+STATS_CACHE_TIMEOUT = 60
+
+
+def get_viewset(viewset_class, request):
+    """Return the viewset scoping the objects the user sees."""
+    return viewset_class(request=request, format_kwarg=None)
+
+
+def rollup(rows, key, sums):
+    """Sum the `sums` of the rows by `key`, sorted by key."""
+    totals = defaultdict(lambda: dict.fromkeys(sums, 0))
+    for row in rows:
+        for name in sums:
+            totals[row[key]][name] += row[name] or 0
+    return [
+        {key: value, **totals[value]}
+        for value in sorted(totals, key=lambda value: (value is None, value))
+    ]
+
+
+def get_contract_stats(contracts):
+    # One query grouped by every dimension, rolled up in Python: the
+    # groups are few (months x sales contacts x 2).
+    rows = list(
+        contracts.annotate(month=TruncMonth('payment_due'))
+        .order_by()
+        .values('month', 'sales_contact', 'signed_status')
+        .annotate(count=Count('id'), amount=Sum('amount'))
+    )
+    for row in rows:
+        row['signed'] = row['count'] if row['signed_status'] else 0
+    sums = ['count', 'amount', 'signed']
+    return {
+        'total': {name: sum(row[name] for row in rows) for name in sums},
+        'by_month': rollup(rows, 'month', sums),
+        'by_sales_contact': rollup(rows, 'sales_contact', sums),
+        'by_signed_status': rollup(rows, 'signed_status', ['count', 'amount']),
+    }
+
+
+def get_event_stats(events):
+    upcoming = Q(event_date__gte=date.today())
+    rows = list(
+        events.annotate(week=TruncWeek('event_date'))
+        .order_by()
+        .values('week', 'support_contact')
+        .annotate(
+            count=Count('id'),
+            attendee_count=Sum('attendees'),
+            upcoming_count=Count('id', filter=upcoming),
+            upcoming_attendees=Sum('attendees', filter=upcoming),
+        )
+    )
+    by_support_contact = rollup(
+        rows, 'support_contact', ['upcoming_count', 'upcoming_attendees']
+    )
+    return {
+        'by_week': [
+            {
+                'week': row['week'],
+                'count': row['count'],
+                'attendees': row['attendee_count'],
+            }
+            for row in rollup(rows, 'week', ['count', 'attendee_count'])
+        ],
+        'upcoming_by_support_contact': [
+            {
+                'support_contact': row['support_contact'],
+                'count': row['upcoming_count'],
+                'attendees': row['upcoming_attendees'],
+            }
+            for row in by_support_contact
+            if row['upcoming_count']
+        ],
+    }
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def stats(request):
+    """Contract and event aggregates of the objects the user sees.
+
+    Cached for STATS_CACHE_TIMEOUT seconds in the response cache, under
+    the scope versions of the contract and event lists of the user (the
+    support members see every contract): a write to their objects
+    computes them again.
+    """
+    contracts = get_viewset(ContractViewset, request)
+    events = get_viewset(EventViewset, request)
+    response_cache = get_response_cache()
+    data = key = None
+    if response_cache is not None:
+        key = STATS_CACHE_KEY.format(
+            user_id=request.user.id,
+            contracts_version=get_scope_version(
+                response_cache,
+                contracts.get_response_cache_scope(request.user),
+            ),
+            events_version=get_scope_version(
+                response_cache, events.get_response_cache_scope(request.user)
+            ),
+        )
+        data = response_cache.get(key)
+    if data is None:
+        data = {
+            'contracts': get_contract_stats(contracts.get_queryset()),
+            'events': get_event_stats(events.get_queryset()),
+        }
+        if key is not None:
+            response_cache.set(key, data, STATS_CACHE_TIMEOUT)
+    logger.debug("GET stats: OK")
+    return Response(data)
@@ -0,0 +1,74 @@
+"""Per sales contact dashboard summaries, see models.SalesSummary."""
+from django.db import transaction
+
+from .models import Client, Event, SalesSummary
+
+
+def collect_ids(instances, sales_contact_ids, client_ids):
+    """Add the ids of the sales contacts whose summary counts the
+    instances, before and after their last change, and of the clients of
+    the events whose sales contact is not known without a query."""
+    for instance in instances:
+        if isinstance(instance, Event):
+            attname, ids = 'client_id', client_ids
+        else:
+            attname, ids = 'sales_contact_id', sales_contact_ids
+        for value in (
+            instance.__dict__.get(attname),
+            getattr(instance, f'_loaded_{attname}', None),
+        ):
+            if value is not None:
+                ids.add(value)
+        # The views save the events with their client loaded.
+        if (
+            isinstance(instance, Event)
+            and Event.client.is_cached(instance)
+            and instance.client.pk == instance.client_id
+        ):
+            sales_contact_ids.add(instance.client.sales_contact_id)
+            client_ids.discard(instance.client_id)
+
+
+def get_sales_contact_ids(instances, client_ids=()):
+    """Return the ids of the sales contacts whose summary counts the
+    instances, or the events of the given clients."""
+    sales_contact_ids = set()
+    client_ids = set(client_ids)
+    collect_ids(instances, sales_contact_ids, client_ids)
+
+    # The events count in the summary of the sales contact of their client.
+    if client_ids:
+        sales_contact_ids.update(
+            Client.objects.filter(pk__in=client_ids).values_list(
+                'sales_contact_id', flat=True
+            )
+        )
+    return sales_contact_ids
+
+
+def refresh_summaries(instances):
+    SalesSummary.refresh(get_sales_contact_ids(instances))
+
+
+def refresh_summaries_on_commit(instance, origin, using=None):
+    """Refresh the summaries counting the instance once the delete from
+    `origin` is committed.
+
+    A cascade delete sends a pre_delete per row: their ids are collected
+    on the origin, without a query, and one refresh per delete runs on
+    commit. By then the deleted clients were counted through their own
+    pre_delete, and the deleted users have no summary to refresh.
+    """
+    pending = origin.__dict__.get('_sales_summary_ids')
+    if pending is None:
+        pending = origin._sales_summary_ids = (set(), set())
+
+        def refresh():
+            del origin._sales_summary_ids
+            sales_contact_ids, client_ids = pending
+            SalesSummary.refresh(
+                sales_contact_ids | get_sales_contact_ids((), client_ids)
+            )
+
+        transaction.on_commit(refresh, using=using)
+    collect_ids([instance], *pending)
@@ -2,6 +2,7 @@ from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 import logging
 
+from rest_framework.decorators import api_view, permission_classes
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -9,6 +10,13 @@ from rest_framework import status
 
 from datetime import date
 
+from crm.db.replicas import ReplicaReadMixin
+from crm.users.roles import is_sales, is_support
+
+from .bulk import BulkModelMixin
+from .cache import ALL_SCOPE, ResponseCacheMixin
+from .conditional import ConditionalGetMixin
+from .export import ExportMixin
 from .permissions import IsSalesContact, IsSupportContact, HasActiveContract
 
 from .serializers import (
@@ -16,21 +24,35 @@ from .serializers import (
     ClientDetailSerializer,
     ContractSerializer,
     EventSerializer,
+    SalesSummarySerializer,
 )
-from .models import Client, Contract, Event
-from .filters import ContractFilter
+from .models import Client, Contract, Event, SalesSummary
+from .filters import ContractFilter, ClientSearchFilter
 
 logger = logging.getLogger(__name__)
 
 
-class ClientViewset(ModelViewSet):
+class ClientViewset(
+    ReplicaReadMixin,
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    BulkModelMixin,
+    ModelViewSet,
+):
     serializer_class = ClientListSerializer
     detail_serializer_class = ClientDetailSerializer
+    expandable_fields = ['events', 'contracts']
+
+    bulk_create_permission = 'events.add_client'
+    bulk_update_permission = 'events.change_client'
 
     permission_classes = [IsAuthenticated, IsSalesContact]
 
-    filter_backends = [DjangoFilterBackend]
+    keyset_ordering = ('-date_created', '-id')
+
+    filter_backends = [DjangoFilterBackend, ClientSearchFilter]
     filterset_fields = ['last_name', 'email']
+    search_fields = ['first_name', 'last_name', 'email']
 
     def get_serializer_class(self):
         if self.action == 'retrieve':
@@ -42,18 +64,50 @@ class ClientViewset(ModelViewSet):
             return [IsSalesContact()]
         return [IsAuthenticated()]
 
+    def get_expand(self):
+        """Return the nested relations requested with ?expand= on a list."""
+        if self.action != 'list':
+            return []
+        expand = self.request.query_params.get('expand', '').split(',')
+        return [name for name in self.expandable_fields if name in expand]
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['expand'] = self.get_expand()
+        return context
+
+    def get_conditional_relations(self):
+        if self.action == 'retrieve':
+            return self.expandable_fields
+        return self.get_expand()
+
     def get_queryset(self):
-        if self.request.user.groups.filter(name='Support'):
+        if is_support(self.request.user):
             logger.debug("GET client(s) by support user: OK")
-            return Client.objects.filter(
+            queryset = Client.objects.filter(
                 events__support_contact=self.request.user.id
-            )
-        elif self.request.user.groups.filter(name='Sales'):
+            ).distinct()
+        elif is_sales(self.request.user):
             logger.debug("GET client(s) by sales user: OK")
-            return Client.objects.filter(sales_contact=self.request.user.id)
-        return Client.objects.all()
+            queryset = Client.objects.filter(
+                sales_contact=self.request.user.id
+            )
+        else:
+            queryset = Client.objects.all()
+
+        # event_status is rendered as a pk, so the events need no join.
+        if self.action == 'retrieve':
+            return queryset.prefetch_related(*self.expandable_fields)
+        return queryset.prefetch_related(*self.get_expand())
+
+    def prepare_bulk_item(self, item):
+        item['sales_contact'] = self.request.user.id
+        item["date_updated"] = date.today()
+        return item
 
     def create(self, request, *args, **kwargs):
+        if isinstance(request.data, list):
+            return self.bulk_create(request)
         user = request.user
         if user.has_perm('events.add_client'):
             client = request.data.copy()
@@ -104,13 +158,32 @@ class ClientViewset(ModelViewSet):
             )
 
 
-class ContractViewset(ModelViewSet):
+class ContractViewset(
+    ReplicaReadMixin,
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    ExportMixin,
+    BulkModelMixin,
+    ModelViewSet,
+):
     serializer_class = ContractSerializer
 
+    bulk_create_permission = 'events.add_contract'
+    bulk_update_permission = 'events.change_contract'
+
     permission_classes = [IsAuthenticated, IsSalesContact]
 
-    filter_backends = [DjangoFilterBackend]
+    export_filename = 'contracts'
+
+    keyset_ordering = ('-date_created', '-id')
+
+    filter_backends = [DjangoFilterBackend, ClientSearchFilter]
     filterset_class = ContractFilter
+    search_fields = [
+        'client__first_name',
+        'client__last_name',
+        'client__email',
+    ]
 
     def get_permissions(self):
         if self.request.method in ['PUT']:
@@ -120,11 +193,35 @@ class ContractViewset(ModelViewSet):
     def get_queryset(self):
         queryset = Contract.objects.all()
 
-        if self.request.user.groups.filter(name='Sales'):
-            queryset = queryset.filter(sales_contact=self.request.user)
+        if is_sales(self.request.user):
+            queryset = queryset.filter(sales_contact=self.request.user.id)
         return queryset
 
+    def get_response_cache_scope(self, user):
+        # The support members see every contract.
+        if is_support(user):
+            return ALL_SCOPE
+        return super().get_response_cache_scope(user)
+
+    def prepare_bulk_item(self, item):
+        item["sales_contact"] = self.request.user.id
+        item["date_updated"] = date.today()
+        return item
+
+    def perform_bulk_save(self, serializer):
+        # bulk_create/bulk_update do not send the signals that keep
+        # Client.has_active_contract up to date.
+        client_ids = {
+            contract.client_id for contract in serializer.instance or []
+        }
+        contracts = serializer.save()
+        client_ids.update(contract.client_id for contract in contracts)
+        Client.refresh_active_contract(client_ids)
+        return contracts
+
     def create(self, request, *args, **kwargs):
+        if isinstance(request.data, list):
+            return self.bulk_create(request)
         user = request.user
         if user.has_perm('events.add_contract'):
             contract = request.data.copy()
@@ -175,9 +272,22 @@ class ContractViewset(ModelViewSet):
             )
 
 
-class EventViewset(ModelViewSet):
+class EventViewset(
+    ReplicaReadMixin,
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    ExportMixin,
+    BulkModelMixin,
+    ModelViewSet,
+):
     serializer_class = EventSerializer
 
+    bulk_create_permission = 'events.add_event'
+    bulk_update_permission = 'events.change_event'
+    bulk_denied_message = (
+        "You are not allowed. Only members of sales team can create a contract."
+    )
+
     permission_classes = [
         IsAuthenticated,
         IsSalesContact,
@@ -185,35 +295,64 @@ class EventViewset(ModelViewSet):
         HasActiveContract,
     ]
 
-    filter_backends = [DjangoFilterBackend]
+    export_filename = 'events'
+
+    keyset_ordering = ('-event_date', '-id')
+
+    filter_backends = [DjangoFilterBackend, ClientSearchFilter]
     filterset_fields = [
         'event_date',
         'client__email',
         'client__last_name',
     ]
+    search_fields = [
+        'client__first_name',
+        'client__last_name',
+        'client__email',
+    ]
 
     def get_permissions(self):
         if self.request.method in ['POST']:
             return [HasActiveContract()]
         elif self.request.method in ['PUT']:
-            if self.request.user.groups.filter(name='Support'):
+            if is_support(self.request.user):
                 return [IsSupportContact()]
-            elif self.request.user.groups.filter(name='Sales'):
+            elif is_sales(self.request.user):
                 return [IsSalesContact()]
         return [IsAuthenticated()]
 
     def get_queryset(self):
-        queryset = Event.objects.all()
+        # IsSalesContact reads event.client.sales_contact_id
+        queryset = Event.objects.select_related('client')
 
-        if self.request.user.groups.filter(name='Sales'):
-            queryset = queryset.filter(client__sales_contact=self.request.user)
+        if is_sales(self.request.user):
+            queryset = queryset.filter(
+                client__sales_contact=self.request.user.id
+            )
             return queryset
-        elif self.request.user.groups.filter(name='Support'):
-            queryset = queryset.filter(support_contact=self.request.user)
+        elif is_support(self.request.user):
+            queryset = queryset.filter(support_contact=self.request.user.id)
             return queryset
         return queryset
 
+    def prepare_bulk_item(self, item):
+        item["date_updated"] = date.today()
+        return item
+
+    def check_bulk_create_permissions(self, validated_data):
+        # The clients were loaded in one query during the validation.
+        return [
+            None
+            if HasActiveContract().has_object_permission(
+                self.request, self, event['client']
+            )
+            else HasActiveContract.message
+            for event in validated_data
+        ]
+
     def create(self, request, *args, **kwargs):
+        if isinstance(request.data, list):
+            return self.bulk_create(request)
         user = request.user
         if user.has_perm('events.add_event'):
             client_id = request.data["client"]
@@ -248,7 +387,9 @@ class EventViewset(ModelViewSet):
         if user.has_perm('events.change_event'):
             data = request.data.copy()
             data["date_updated"] = date.today()
-            event = get_object_or_404(Event, pk=self.kwargs['pk'])
+            event = get_object_or_404(
+                Event.objects.select_related('client'), pk=self.kwargs['pk']
+            )
             self.check_object_permissions(request, event)
             serializer = EventSerializer(event, data=data)
             serializer.is_valid(raise_exception=True)
@@ -262,3 +403,47 @@ class EventViewset(ModelViewSet):
                 {'message': "You are not allowed."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def sales_summary(request):
+    """Summary of the sales user, or of the sales user
+    `?sales_contact=<id>` for the managers. One query, unless the summary
+    is missing or was computed on an earlier day."""
+    if is_support(request.user):
+        logger.debug("GET sales summary by support user: denied")
+        return Response(
+            {'message': 'Support users have no sales summary.'},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+    if is_sales(request.user):
+        user_id = request.user.id
+    else:
+        try:
+            user_id = int(request.query_params['sales_contact'])
+        except KeyError:
+            return Response(
+                {'message': 'Sales User Does Not Exist'},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        except ValueError:
+            return Response(
+                {'message': 'sales_contact must be a user id.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+    # A summary stored before its user left the sales group is not served.
+    summary = SalesSummary.objects.filter(
+        sales_contact__in=SalesSummary.get_sales_users().filter(pk=user_id)
+    ).first()
+    if summary is None or summary.computed_on < date.today():
+        summaries = SalesSummary.refresh([user_id])
+        if not summaries:
+            return Response(
+                {'message': 'Sales User Does Not Exist'},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        (summary,) = summaries
+    logger.debug("GET sales summary: OK")
+    return Response(SalesSummarySerializer(summary).data)
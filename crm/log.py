@@ -0,0 +1,92 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+
+class JsonFormatter(logging.Formatter):
+    """Format a record as a single line JSON object."""
+
+    def format(self, record):
+        payload = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'module': record.module,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of the DEBUG records.
+
+    Records above DEBUG are always kept.
+    """
+
+    def __init__(self, rate=1.0):
+        super().__init__()
+        self.rate = float(rate)
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG:
+            return True
+        return random.random() < self.rate
+
+
+class QueueListenerHandler(QueueHandler):
+    """Write the records to a rotating file from a background thread.
+
+    The request thread only formats the record and puts it in a bounded
+    queue; records are dropped rather than blocking when the queue is full.
+    """
+
+    def __init__(
+        self,
+        filename,
+        max_bytes=10 * 1024 * 1024,
+        backup_count=5,
+        queue_size=10000,
+    ):
+        super().__init__(queue.Queue(queue_size))
+        self.target = RotatingFileHandler(
+            filename,
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding='utf-8',
+            delay=True,
+        )
+        self.listener = None
+        self.listener_pid = None
+        self.dropped = 0
+        atexit.register(self.stop_listener)
+
+    def start_listener(self):
+        # The listener thread does not survive a fork (e.g. gunicorn
+        # preload), so each process starts its own.
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+        self.listener_pid = os.getpid()
+
+    def stop_listener(self):
+        if self.listener is not None and self.listener_pid == os.getpid():
+            self.listener.stop()
+            self.listener = None
+
+    def enqueue(self, record):
+        if self.listener_pid != os.getpid():
+            self.start_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        self.stop_listener()
+        self.target.close()
+        super().close()
@@ -0,0 +1,233 @@
+import atexit
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Lock
+
+from django.conf import settings
+from django.http import HttpResponse
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def get_metrics_setting(name):
+    defaults = {
+        'DIRECTORY': None,
+        'FLUSH_INTERVAL': 5,
+    }
+    return getattr(settings, 'CRM_METRICS', {}).get(name, defaults[name])
+
+
+class Registry:
+    """Histograms of the process, shared with the other workers through
+    one JSON file per process in CRM_METRICS['DIRECTORY']."""
+
+    def __init__(self):
+        self.histograms = {}
+        self.lock = Lock()
+        self.flushed_at = 0
+
+    def register(self, histogram):
+        self.histograms[histogram.name] = histogram
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                name: [
+                    [
+                        list(labels),
+                        dict(series, buckets=list(series['buckets'])),
+                    ]
+                    for labels, series in histogram.series.items()
+                ]
+                for name, histogram in self.histograms.items()
+            }
+
+    def get_path(self, pid):
+        return Path(get_metrics_setting('DIRECTORY')) / f'{pid}.json'
+
+    def flush(self):
+        """Write the histograms of the process to the shared directory."""
+        if not get_metrics_setting('DIRECTORY'):
+            return
+        path = self.get_path(os.getpid())
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix('.tmp')
+        temporary.write_text(json.dumps(self.snapshot()))
+        temporary.replace(path)
+        self.flushed_at = time.monotonic()
+
+    def maybe_flush(self):
+        interval = get_metrics_setting('FLUSH_INTERVAL')
+        if time.monotonic() - self.flushed_at >= interval:
+            try:
+                self.flush()
+            except OSError:
+                # The metrics never fail a request.
+                self.flushed_at = time.monotonic()
+
+    def collect(self):
+        """Return the histograms of every worker, summed by labels."""
+        snapshots = [self.snapshot()]
+        directory = get_metrics_setting('DIRECTORY')
+        if directory:
+            own_path = self.get_path(os.getpid())
+            for path in Path(directory).glob('*.json'):
+                if path != own_path:
+                    try:
+                        snapshots.append(json.loads(path.read_text()))
+                    except (OSError, ValueError):
+                        continue
+
+        merged = {name: {} for name in self.histograms}
+        for snapshot in snapshots:
+            for name, series_list in snapshot.items():
+                if name not in merged:
+                    continue
+                for labels, series in series_list:
+                    total = merged[name].setdefault(
+                        tuple(labels),
+                        {
+                            'buckets': [0] * len(series['buckets']),
+                            'sum': 0.0,
+                            'count': 0,
+                        },
+                    )
+                    for i, count in enumerate(series['buckets']):
+                        total['buckets'][i] += count
+                    total['sum'] += series['sum']
+                    total['count'] += series['count']
+        return merged
+
+    def render(self):
+        """Render the histograms in the Prometheus text format."""
+        lines = []
+        for name, series in sorted(self.collect().items()):
+            histogram = self.histograms[name]
+            lines.append(f'# HELP {name} {histogram.documentation}')
+            lines.append(f'# TYPE {name} histogram')
+            for labels, values in sorted(series.items()):
+                pairs = list(zip(histogram.labelnames, labels))
+                for bound, count in zip(histogram.buckets, values['buckets']):
+                    lines.append(
+                        f'{name}_bucket'
+                        f'{format_labels(pairs + [("le", bound)])} {count}'
+                    )
+                lines.append(
+                    f'{name}_bucket{format_labels(pairs + [("le", "+Inf")])} '
+                    f'{values["count"]}'
+                )
+                lines.append(
+                    f'{name}_sum{format_labels(pairs)} {values["sum"]}'
+                )
+                lines.append(
+                    f'{name}_count{format_labels(pairs)} {values["count"]}'
+                )
+        return '\n'.join(lines) + '\n'
+
+
+def format_labels(pairs):
+    if not pairs:
+        return ''
+    labels = ','.join(
+        '{}="{}"'.format(
+            name,
+            str(value)
+            .replace('\\', r'\\')
+            .replace('\n', r'\n')
+            .replace('"', r'\"'),
+        )
+        for name, value in pairs
+    )
+    return '{' + labels + '}'
+
+
+registry = Registry()
+atexit.register(registry.flush)
+
+
+class Histogram:
+    """Histogram of observations, with cumulative buckets."""
+
+    def __init__(
+        self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.series = {}
+        registry.register(self)
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with registry.lock:
+            series = self.series.setdefault(
+                key,
+                {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0},
+            )
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['buckets'][i] += 1
+            series['sum'] += value
+            series['count'] += 1
+        registry.maybe_flush()
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+
+REQUEST_DURATION = Histogram(
+    'crm_request_duration_seconds',
+    'Duration of the requests by view and action.',
+    ['view', 'action', 'status'],
+)
+DB_DURATION = Histogram(
+    'crm_db_duration_seconds',
+    'Time spent in database queries by view and action.',
+    ['view', 'action'],
+)
+JWT_DECODE_DURATION = Histogram(
+    'crm_jwt_decode_seconds',
+    'Duration of the access token validation.',
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01),
+)
+PASSWORD_HASH_DURATION = Histogram(
+    'crm_password_hash_seconds',
+    'Duration of the password hashing of the login view.',
+)
+PAGINATION_OFFSET = Histogram(
+    'crm_pagination_offset',
+    'Offset of the limit/offset list pages by view.',
+    ['view'],
+    buckets=(0, 10, 100, 1000, 10000, 100000, 1000000),
+)
+
+
+def get_view_labels(request):
+    """Return the viewset and action (or url name and method) of a
+    request."""
+    match = request.resolver_match
+    if match is None:
+        return {'view': '', 'action': request.method.lower()}
+    actions = getattr(match.func, 'actions', None)
+    if actions:
+        return {
+            'view': match.func.cls.__name__,
+            'action': actions.get(request.method.lower(), ''),
+        }
+    return {'view': match.view_name, 'action': request.method.lower()}
+
+
+def metrics(request):
+    """Expose the metrics of every worker to Prometheus."""
+    return HttpResponse(
+        registry.render(), content_type='text/plain; version=0.0.4'
+    )
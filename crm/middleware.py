@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from crm.metrics import DB_DURATION, REQUEST_DURATION, get_view_labels
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUERY_BUDGETS = {
+    'DEFAULT': {'QUERIES': 20, 'TIME_MS': 500},
+    'ROUTES': {},
+    'DUPLICATE_THRESHOLD': 3,
+}
+
+
+class QueryProfile:
+    """execute_wrapper counting and timing the queries of a request."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.statements[sql] += 1
+
+    def duplicates(self, threshold):
+        """Return the statements run at least `threshold` times, the
+        signature of an N+1 pattern."""
+        return {
+            sql: count
+            for sql, count in self.statements.items()
+            if count >= threshold
+        }
+
+
+# Profile of the current request. A context variable, as the async views
+# run their queries in sync_to_async threads, on other connection objects
+# than the ones of the event loop; the context is copied to those threads.
+_query_profile = ContextVar('query_profile', default=None)
+
+
+def profile_queries(execute, sql, params, many, context):
+    """execute_wrapper of every connection, handing the queries to the
+    profile of the current request."""
+    profile = _query_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    return profile(execute, sql, params, many, context)
+
+
+def install_query_profiling(sender, connection, **kwargs):
+    """connection_created receiver, connected in EventsConfig.ready."""
+    if profile_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(profile_queries)
+
+
+def get_query_budgets():
+    return {
+        **DEFAULT_QUERY_BUDGETS,
+        **getattr(settings, 'CRM_QUERY_BUDGETS', {}),
+    }
+
+
+class QueryProfilingMiddleware:
+    """Profile the SQL queries of each request.
+
+    The totals are sent in a Server-Timing header and recorded in the
+    histograms of crm.metrics, and a warning is logged when a route
+    exceeds its budget (CRM_QUERY_BUDGETS) or repeats the same statement.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # Same switch as django.utils.deprecation.MiddlewareMixin: an async
+        # view is awaited without a thread hop for the whole request.
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+        else:
+            self._is_coroutine = None
+
+    def __call__(self, request):
+        if self._is_coroutine:
+            return self.__acall__(request)
+        profile = self.start(request)
+        start = time.perf_counter()
+        token = _query_profile.set(profile)
+        try:
+            response = self.get_response(request)
+        finally:
+            _query_profile.reset(token)
+        return self.finish(request, response, profile, start)
+
+    async def __acall__(self, request):
+        profile = self.start(request)
+        start = time.perf_counter()
+        token = _query_profile.set(profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _query_profile.reset(token)
+        return self.finish(request, response, profile, start)
+
+    def start(self, request):
+        profile = QueryProfile()
+        request.query_profile = profile
+        return profile
+
+    def finish(self, request, response, profile, start):
+        total = time.perf_counter() - start
+        response['Server-Timing'] = (
+            f'db;dur={profile.duration * 1000:.1f};'
+            f'desc="{profile.count} queries", '
+            f'total;dur={total * 1000:.1f}'
+        )
+        self.check_budget(request, profile, total)
+        self.observe(request, response, profile, total)
+        return response
+
+    def observe(self, request, response, profile, total):
+        labels = get_view_labels(request)
+        REQUEST_DURATION.observe(total, status=response.status_code, **labels)
+        DB_DURATION.observe(profile.duration, **labels)
+
+    def check_budget(self, request, profile, total):
+        match = request.resolver_match
+        route = match.view_name if match else request.path
+        budgets = get_query_budgets()
+        budget = {**budgets['DEFAULT'], **budgets['ROUTES'].get(route, {})}
+
+        if profile.count > budget['QUERIES']:
+            logger.warning(
+                "%s %s: %d queries, over the budget of %d",
+                request.method,
+                route,
+                profile.count,
+                budget['QUERIES'],
+            )
+        if total * 1000 > budget['TIME_MS']:
+            logger.warning(
+                "%s %s: %.0f ms, over the budget of %d ms",
+                request.method,
+                route,
+                total * 1000,
+                budget['TIME_MS'],
+            )
+        threshold = budgets['DUPLICATE_THRESHOLD']
+        for sql, count in profile.duplicates(threshold).items():
+            logger.warning(
+                "%s %s: same query run %d times: %s",
+                request.method,
+                route,
+                count,
+                sql,
+            )
@@ -0,0 +1,143 @@
+from asgiref.sync import sync_to_async
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from crm.metrics import JWT_DECODE_DURATION
+
+from .roles import aget_user_version, get_roles, get_user_version
+
+GROUPS_CLAIM = 'groups'
+PERMISSIONS_CLAIM = 'perms'
+VERSION_CLAIM = 'version'
+
+
+def get_token_for_user(user):
+    """Return a refresh token holding the roles and permissions of the user,
+    copied into its access tokens."""
+    refresh = RefreshToken.for_user(user)
+    refresh[VERSION_CLAIM] = get_user_version(user.pk)
+    refresh[GROUPS_CLAIM] = sorted(get_roles(user))
+    refresh[PERMISSIONS_CLAIM] = sorted(user.get_all_permissions())
+    return refresh
+
+
+class ClaimsUser(TokenUser):
+    """User built from the claims of an access token, without any query."""
+
+    def __init__(self, token):
+        super().__init__(token)
+        # Read by crm.users.roles.get_roles
+        self._crm_roles = frozenset(token[GROUPS_CLAIM])
+        self.permissions = frozenset(token[PERMISSIONS_CLAIM])
+
+    def get_all_permissions(self, obj=None):
+        return set(self.permissions)
+
+    def has_perm(self, perm, obj=None):
+        return perm in self.permissions
+
+    def has_perms(self, perm_list, obj=None):
+        return all(self.has_perm(perm, obj) for perm in perm_list)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """JWT authentication building the user from the token claims on
+    read requests.
+
+    The user is loaded from the database for write requests, for tokens
+    issued before the claims existed and for revoked tokens: a token is
+    revoked when the user version changed since it was issued (groups or
+    user updated, see crm.users.signals).
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        with JWT_DECODE_DURATION.time():
+            validated_token = self.get_validated_token(raw_token)
+
+        if request.method in SAFE_METHODS and self.has_valid_claims(
+            validated_token
+        ):
+            return ClaimsUser(validated_token), validated_token
+        return self.get_user(validated_token), validated_token
+
+    def has_valid_claims(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+            version = validated_token[VERSION_CLAIM]
+        except KeyError:
+            return False
+        return (
+            GROUPS_CLAIM in validated_token
+            and PERMISSIONS_CLAIM in validated_token
+            and version == get_user_version(user_id)
+        )
+
+    async def aauthenticate(self, request):
+        """Async authenticate, for the async read views.
+
+        The user is built from the claims without any query or thread
+        hop; a user loaded from the database uses the async ORM.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        with JWT_DECODE_DURATION.time():
+            validated_token = self.get_validated_token(raw_token)
+
+        if await self.ahas_valid_claims(validated_token):
+            return ClaimsUser(validated_token), validated_token
+        return await self.aget_user(validated_token), validated_token
+
+    async def ahas_valid_claims(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+            version = validated_token[VERSION_CLAIM]
+        except KeyError:
+            return False
+        return (
+            GROUPS_CLAIM in validated_token
+            and PERMISSIONS_CLAIM in validated_token
+            and version == await aget_user_version(user_id)
+        )
+
+    async def aget_user(self, validated_token):
+        """Async get_user, loading the roles of the user as well."""
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
+        try:
+            user = await self.user_model.objects.aget(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found"
+            )
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+        await sync_to_async(get_roles)(user)
+        return user
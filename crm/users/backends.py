@@ -0,0 +1,106 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+
+from .roles import get_user_version
+
+PERMISSIONS_CACHE_KEY = (
+    'crm:users:{user_id}:v{version}:p{global_version}:perms'
+)
+GLOBAL_VERSION_CACHE_KEY = 'crm:users:permissions:version'
+
+
+class LRUCache:
+    """Small thread-safe LRU mapping, local to the process."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, key):
+        with self.lock:
+            value = self.data.get(key)
+            if value is not None:
+                self.data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+
+
+local_cache = LRUCache(settings.PERMISSIONS_CACHE['LOCAL_SIZE'])
+
+
+def get_shared_cache():
+    alias = settings.PERMISSIONS_CACHE['ALIAS']
+    return caches[alias] if alias else None
+
+
+def get_global_version():
+    """Return the version of the group permissions, bumped when the
+    permissions of any group change.
+
+    The version lives in the default cache, shared by the workers (see
+    the crm.E001 check), so that a bump reaches the local LRU of every
+    process. A version evicted by the cache starts again from the current
+    time, so that it never matches the permissions stored before.
+    """
+    return caches['default'].get_or_set(
+        GLOBAL_VERSION_CACHE_KEY, time.time_ns, None
+    )
+
+
+def bump_global_version():
+    try:
+        caches['default'].incr(GLOBAL_VERSION_CACHE_KEY)
+    except ValueError:
+        caches['default'].set(GLOBAL_VERSION_CACHE_KEY, time.time_ns(), None)
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend caching the permission codenames of the users.
+
+    The codenames are kept in a process local LRU and in an optional
+    Django cache, keyed by the user version and the group permissions
+    version, so that has_perm costs no query in steady state.
+    """
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, '_perm_cache'):
+            user_obj._perm_cache = self.get_cached_permissions(user_obj)
+        return user_obj._perm_cache
+
+    def get_cached_permissions(self, user_obj):
+        key = PERMISSIONS_CACHE_KEY.format(
+            user_id=user_obj.pk,
+            version=get_user_version(user_obj.pk),
+            global_version=get_global_version(),
+        )
+        permissions = local_cache.get(key)
+        if permissions is not None:
+            return permissions
+
+        shared_cache = get_shared_cache()
+        if shared_cache is not None:
+            permissions = shared_cache.get(key)
+        if permissions is None:
+            permissions = frozenset(super().get_all_permissions(user_obj))
+            if shared_cache is not None:
+                shared_cache.set(key, permissions)
+        local_cache.set(key, permissions)
+        return permissions
@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+from crm.db.replicas import get_replicas_setting
+
+# Backends keeping the entries in the memory of each process.
+PROCESS_LOCAL_BACKENDS = ('django.core.cache.backends.locmem.LocMemCache',)
+
+
+def check_shared_caches(aliases, purpose):
+    """Return an error for each of the cache aliases local to a process:
+    a version bumped by a worker would not reach the others."""
+    return [
+        Error(
+            f"The {alias!r} cache ({settings.CACHES[alias]['BACKEND']}) "
+            f"is local to each process, it cannot hold {purpose}.",
+            hint=(
+                "Use a cache shared by the workers: FileBasedCache on a "
+                "single host, RedisCache or PyMemcacheCache otherwise. "
+                "Silence the check for a single process server."
+            ),
+            id='crm.E001',
+        )
+        for alias in dict.fromkeys(aliases)
+        if alias
+        and settings.CACHES[alias]['BACKEND'] in PROCESS_LOCAL_BACKENDS
+    ]
+
+
+@register()
+def check_users_cache(app_configs, **kwargs):
+    return check_shared_caches(
+        ['default', settings.PERMISSIONS_CACHE['ALIAS']],
+        "the user versions revoking the tokens and the permissions",
+    )
+
+
+@register()
+def check_replicas_cache(app_configs, **kwargs):
+    if not get_replicas_setting('ALIASES'):
+        return []
+    return check_shared_caches(
+        [get_replicas_setting('CACHE_ALIAS')],
+        "the users reading from the primary after a write",
+    )
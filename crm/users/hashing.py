@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+
+from crm.metrics import PASSWORD_HASH_DURATION
+
+
+class HashingUnavailable(Exception):
+    """Raised when too many password hashes are already pending."""
+
+
+_pool = ThreadPoolExecutor(
+    max_workers=settings.LOGIN_HASHING_WORKERS,
+    thread_name_prefix='login-hashing',
+)
+_slots = BoundedSemaphore(settings.LOGIN_HASHING_QUEUE_SIZE)
+
+
+def _submit(function, *args):
+    # A login storm is refused instead of piling up hashes that would
+    # starve the threads serving the API.
+    if not _slots.acquire(blocking=False):
+        raise HashingUnavailable()
+    try:
+        with PASSWORD_HASH_DURATION.time():
+            return _pool.submit(function, *args).result()
+    finally:
+        _slots.release()
+
+
+def _check(password, encoded):
+    must_update = []
+    valid = check_password(password, encoded, setter=must_update.append)
+    return valid, bool(must_update)
+
+
+def verify_password(user, password):
+    """Check the password of the user in the hashing pool.
+
+    When the user is None, a dummy hash is computed so that an unknown
+    username takes as long as a wrong password.
+    """
+    if user is None:
+        _submit(make_password, password)
+        return False
+    valid, must_update = _submit(_check, password, user.password)
+    if must_update:
+        user.set_password(password)
+        user.save(update_fields=['password'])
+    return valid
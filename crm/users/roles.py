@@ -0,0 +1,75 @@
+import time
+
+from django.core.cache import cache
+
+SALES = 'Sales'
+SUPPORT = 'Support'
+
+ROLES_CACHE_KEY = 'crm:users:{user_id}:v{version}:roles'
+VERSION_CACHE_KEY = 'crm:users:{user_id}:version'
+ROLES_CACHE_TIMEOUT = 60 * 60
+
+
+def get_user_version(user_id):
+    """Return the cache version of a user, bumped when the user or their
+    groups change.
+
+    A missing version starts from the current time, so that a version lost
+    by the cache never matches one stored in an older access token.
+    """
+    return cache.get_or_set(
+        VERSION_CACHE_KEY.format(user_id=user_id),
+        time.time_ns,
+        None,
+    )
+
+
+async def aget_user_version(user_id):
+    """Async get_user_version, for the async views."""
+    return await cache.aget_or_set(
+        VERSION_CACHE_KEY.format(user_id=user_id),
+        time.time_ns,
+        None,
+    )
+
+
+def bump_user_version(user_ids):
+    """Invalidate the cached roles (and the access token claims)
+    of the given users."""
+    for user_id in user_ids:
+        key = VERSION_CACHE_KEY.format(user_id=user_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def get_roles(user):
+    """Return the group names of the user.
+
+    The names are loaded once per request (stored on the user instance)
+    and shared between requests through the cache.
+    """
+    if not user or not user.is_authenticated:
+        return frozenset()
+    roles = getattr(user, '_crm_roles', None)
+    if roles is not None:
+        return roles
+
+    key = ROLES_CACHE_KEY.format(
+        user_id=user.pk, version=get_user_version(user.pk)
+    )
+    roles = cache.get(key)
+    if roles is None:
+        roles = frozenset(user.groups.values_list('name', flat=True))
+        cache.set(key, roles, ROLES_CACHE_TIMEOUT)
+    user._crm_roles = roles
+    return roles
+
+
+def is_sales(user):
+    return SALES in get_roles(user)
+
+
+def is_support(user):
+    return SUPPORT in get_roles(user)
@@ -0,0 +1,108 @@
+from django.contrib.auth.models import Group, Permission
+from django.db.models import Q
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+
+from .backends import bump_global_version
+from .models import User
+from .roles import bump_user_version
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_roles_on_groups_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """Invalidate the cached roles when a user joins or leaves a group."""
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        bump_user_version([instance.pk])
+    elif action == 'pre_clear':
+        bump_user_version(instance.user_set.values_list('pk', flat=True))
+    else:
+        bump_user_version(pk_set)
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def invalidate_roles_on_group_change(sender, instance, **kwargs):
+    """Invalidate the cached roles of the members of a renamed
+    or deleted group."""
+    if not kwargs.get('created'):
+        bump_user_version(instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_roles_on_user_change(sender, instance, **kwargs):
+    """A new user may reuse the id of a deleted one, and an updated or
+    deleted user must not be authenticated from the token claims."""
+    bump_user_version([instance.pk])
+
+
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_permissions_on_user_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """Invalidate the cached permissions of a user given
+    or removed a permission."""
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        bump_user_version([instance.pk])
+    elif action == 'pre_clear':
+        bump_user_version(instance.user_set.values_list('pk', flat=True))
+    else:
+        bump_user_version(pk_set)
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_permissions_on_group_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """Invalidate the cached permissions of every user, and the token
+    claims of the members, when the permissions of a group change."""
+    if action == 'pre_clear':
+        # Bumped once cleared, not to cache the permissions in between.
+        instance._cleared_group_ids = (
+            list(instance.group_set.values_list('pk', flat=True))
+            if reverse
+            else [instance.pk]
+        )
+        return
+    if action == 'post_clear':
+        group_ids = instance._cleared_group_ids
+    elif action in ('post_add', 'post_remove'):
+        group_ids = pk_set if reverse else [instance.pk]
+    else:
+        return
+    bump_user_version(
+        User.objects.filter(groups__in=group_ids)
+        .values_list('pk', flat=True)
+        .distinct()
+    )
+    bump_global_version()
+
+
+@receiver(pre_delete, sender=Permission)
+def find_users_of_deleted_permission(sender, instance, **kwargs):
+    instance._user_ids = list(
+        User.objects.filter(
+            Q(user_permissions=instance) | Q(groups__permissions=instance)
+        )
+        .values_list('pk', flat=True)
+        .distinct()
+    )
+
+
+@receiver(post_delete, sender=Permission)
+def invalidate_permissions_on_permission_delete(sender, instance, **kwargs):
+    """Invalidate the cached permissions of every user, and the token
+    claims of the users given the permission."""
+    bump_user_version(getattr(instance, '_user_ids', ()))
+    bump_global_version()
@@ -1,9 +1,10 @@
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.decorators import api_view
-from rest_framework_simplejwt.tokens import RefreshToken
 import logging
 
+from .authentication import get_token_for_user
+from .hashing import HashingUnavailable, verify_password
 from .models import User
 
 logger = logging.getLogger(__name__)
@@ -13,24 +14,31 @@ logger = logging.getLogger(__name__)
 def login(request):
     username = request.data['username']
     password = request.data['password']
-    if User.objects.filter(username=username).exists():
-        user = User.objects.get(username=username)
-        if user.check_password(password):
-            refresh = RefreshToken.for_user(user)
-            logging.debug("login: OK")
-            return Response(
-                {"refresh": str(refresh), "access": str(refresh.access_token)},
-                status=status.HTTP_200_OK,
-            )
-        else:
-            logging.debug("login: invalid password")
-            return Response(
-                {'message': 'Invalid Password'},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-    else:
-        logging.debug("login: user does not exist")
+    user = User.objects.filter(username=username).first()
+    try:
+        valid = verify_password(user, password)
+    except HashingUnavailable:
+        logger.warning("login: too many pending logins")
+        return Response(
+            {'message': 'Too many login attempts, please retry later.'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+    if user is None:
+        logger.debug("login: user does not exist")
         return Response(
             {'message': 'User Does Not Exist'},
             status=status.HTTP_400_BAD_REQUEST,
         )
+    if valid:
+        refresh = get_token_for_user(user)
+        logger.debug("login: OK")
+        return Response(
+            {"refresh": str(refresh), "access": str(refresh.access_token)},
+            status=status.HTTP_200_OK,
+        )
+    else:
+        logger.debug("login: invalid password")
+        return Response(
+            {'message': 'Invalid Password'},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
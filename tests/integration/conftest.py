@@ -2,8 +2,10 @@ import pytest
 
 from crm.users.models import User
 from crm.events.models import Client, Event, Contract, EventStatus
+from crm.events.seeding import get_group
+from crm.users.roles import SALES, SUPPORT
 
-from django.contrib.auth.models import Group, Permission
+from django.core.cache import caches
 from django.test import Client as c
 
 
@@ -13,6 +15,20 @@ def client():
     return client
 
 
+@pytest.fixture(autouse=True)
+def fast_password_hasher(settings):
+    """Hasher rapide pour ne pas payer le coût de PBKDF2 à chaque test."""
+    settings.PASSWORD_HASHERS = [
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+    ]
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    """Les ids des utilisateurs sont réutilisés d'un test à l'autre."""
+    caches['responses'].clear()
+
+
 @pytest.fixture
 def sales_member_one():
     """Créer un membre de l'équipe sales en BDD."""
@@ -21,29 +37,8 @@ def sales_member_one():
         username="sales1", password="vente1111"
     )
 
-    # créer un groupe d'utilisateur 'support'
-    sales_group, created = Group.objects.get_or_create(name='Sales')
-
-    # ajouter des permissions au groupe
-    perm_add_client = Permission.objects.get(codename='add_client')
-    perm_view_client = Permission.objects.get(codename='view_client')
-    perm_change_client = Permission.objects.get(codename='change_client')
-    perm_add_contract = Permission.objects.get(codename='add_contract')
-    perm_change_contract = Permission.objects.get(codename='change_contract')
-    perm_add_event = Permission.objects.get(codename='add_event')
-    perm_change_event = Permission.objects.get(codename='change_event')
-    sales_group.permissions.add(
-        perm_add_client,
-        perm_view_client,
-        perm_change_client,
-        perm_add_contract,
-        perm_change_contract,
-        perm_add_event,
-        perm_change_event,
-    )
-
-    # ajouter l'utilisateur au groupe
-    sales_group.user_set.add(sales_one)
+    # ajouter l'utilisateur au groupe 'Sales' et à ses permissions
+    get_group(SALES).user_set.add(sales_one)
 
     return sales_one
 
@@ -56,85 +51,38 @@ def sales_member_two():
         username="sales2", password="vente2222"
     )
 
-    # créer un groupe d'utilisateur 'support'
-    sales_group, created = Group.objects.get_or_create(name='Sales')
-
-    # ajouter des permissions au groupe
-    perm_add_client = Permission.objects.get(codename='add_client')
-    perm_change_client = Permission.objects.get(codename='change_client')
-    perm_add_contract = Permission.objects.get(codename='add_contract')
-    perm_change_contract = Permission.objects.get(codename='change_contract')
-    perm_add_event = Permission.objects.get(codename='add_event')
-    perm_change_event = Permission.objects.get(codename='change_event')
-    sales_group.permissions.add(
-        perm_add_client,
-        perm_change_client,
-        perm_add_contract,
-        perm_change_contract,
-        perm_add_event,
-        perm_change_event,
-    )
-
-    # ajouter l'utilisateur au groupe
-    sales_group.user_set.add(sales_two)
+    # ajouter l'utilisateur au groupe 'Sales' et à ses permissions
+    get_group(SALES).user_set.add(sales_two)
 
     return sales_two
 
 
 @pytest.fixture
 def support_member_one():
-    """Créer un membre de l'équipe sales en BDD."""
+    """Créer un membre de l'équipe support en BDD."""
     # créer un utilisateur
     support_one = User.objects.create_user(
         username="support1", password="help1111"
     )
 
-    # créer un groupe d'utilisateur 'support'
-    sales_group, created = Group.objects.get_or_create(name='Support')
-
-    # ajouter des permissions au groupe
-    perm_view_client = Permission.objects.get(codename='view_client')
-    perm_view_contract = Permission.objects.get(codename='view_contract')
-    perm_view_event = Permission.objects.get(codename='view_event')
-    perm_change_event = Permission.objects.get(codename='change_event')
-    sales_group.permissions.add(
-        perm_view_client,
-        perm_view_contract,
-        perm_view_event,
-        perm_change_event,
-    )
-
-    # ajouter l'utilisateur au groupe
-    sales_group.user_set.add(support_one)
+    # ajouter l'utilisateur au groupe 'Support' et à ses permissions
+    get_group(SUPPORT).user_set.add(support_one)
 
     return support_one
 
 
 @pytest.fixture
 def support_member_two():
-    """Créer un membre de l'équipe sales en BDD."""
+    """Créer un membre de l'équipe support en BDD."""
     # créer un utilisateur
     support_two = User.objects.create_user(
         username="support2", password="help2222"
     )
 
-    # créer un groupe d'utilisateur 'support'
-    sales_group, created = Group.objects.get_or_create(name='Support')
-
-    # ajouter des permissions au groupe
-    perm_view_client = Permission.objects.get(codename='view_client')
-    perm_view_contract = Permission.objects.get(codename='view_contract')
-    perm_view_event = Permission.objects.get(codename='view_event')
-    perm_change_event = Permission.objects.get(codename='change_event')
-    sales_group.permissions.add(
-        perm_view_client,
-        perm_view_contract,
-        perm_view_event,
-        perm_change_event,
-    )
+    # ajouter l'utilisateur au groupe 'Support' et à ses permissions
+    get_group(SUPPORT).user_set.add(support_two)
 
-    # ajouter l'utilisateur au groupe
-    sales_group.user_set.add(support_two)
+    return support_two
 
 
 @pytest.fixture
@@ -0,0 +1,52 @@
+import pytest
+
+from crm.events.models import Client, Contract
+from crm.events.permissions import HasActiveContract
+
+
+class TestActiveContract:
+    @pytest.mark.django_db
+    def test_flag_follows_signed_contracts(self, client_one, contract_one):
+        """The flag is set by a signed contract and cleared when
+        the contract is unsigned or deleted."""
+
+        client_one.refresh_from_db()
+        assert client_one.has_active_contract
+
+        contract = Contract.objects.get(pk=contract_one.pk)
+        contract.signed_status = False
+        contract.save()
+        client_one.refresh_from_db()
+        assert not client_one.has_active_contract
+
+        contract.signed_status = True
+        contract.save()
+        contract.delete()
+        client_one.refresh_from_db()
+        assert not client_one.has_active_contract
+
+    @pytest.mark.django_db
+    def test_flag_follows_moved_contract(
+        self, client_one, client_two, contract_one
+    ):
+        """Moving a contract to another client refreshes both clients."""
+
+        contract = Contract.objects.get(pk=contract_one.pk)
+        contract.client = client_two
+        contract.save()
+
+        assert not Client.objects.get(pk=client_one.pk).has_active_contract
+        assert Client.objects.get(pk=client_two.pk).has_active_contract
+
+    @pytest.mark.django_db
+    def test_permission_check_runs_no_query(
+        self, client_one, contract_one, django_assert_num_queries
+    ):
+        """HasActiveContract reads the flag of the fetched client."""
+
+        client = Client.objects.get(pk=client_one.pk)
+
+        with django_assert_num_queries(0):
+            assert HasActiveContract().has_object_permission(
+                None, None, client
+            )
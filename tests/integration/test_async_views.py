@@ -0,0 +1,126 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from rest_framework.test import APIClient
+
+from django.test import AsyncClient
+from django.urls import reverse
+
+from crm.users.roles import bump_user_version
+
+
+class TestAsyncViews:
+    client = APIClient()
+    async_client = AsyncClient()
+
+    def login(self, username, password):
+        credentials = {"username": username, "password": password}
+        response_login = self.client.post(reverse('login'), credentials)
+        token = response_login.data['access']
+
+        return token
+
+    def async_get(self, url, token=None):
+        # AsyncClient takes the ASGI header names.
+        headers = {'AUTHORIZATION': f'Bearer {token}'} if token else {}
+
+        async def get():
+            return await self.async_client.get(url, **headers)
+
+        return async_to_sync(get)()
+
+    def sync_get(self, url, token):
+        response = self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}')
+        return json.loads(response.content)
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('resource', ['client', 'contract', 'event'])
+    def test_same_list_as_sync_views(
+        self, event_one, contract_one, sales_member_one, resource
+    ):
+        """The async list returns the data of the viewset list."""
+
+        token = self.login(username="sales1", password="vente1111")
+
+        response = self.async_get(reverse(f'async-{resource}-list'), token)
+
+        assert response.status_code == 200
+        assert response.json() == self.sync_get(
+            reverse(f'{resource}-list'), token
+        )
+        assert response.json()['count'] == 1
+
+    @pytest.mark.django_db
+    def test_same_detail_as_sync_views(
+        self, event_one, contract_one, sales_member_one
+    ):
+        """The async retrieve renders the nested objects of a client."""
+
+        token = self.login(username="sales1", password="vente1111")
+        client_id = event_one.client_id
+
+        response = self.async_get(
+            reverse('async-client-detail', args=[client_id]), token
+        )
+
+        assert response.status_code == 200
+        assert response.json() == self.sync_get(
+            reverse('client-detail', args=[client_id]), token
+        )
+        assert len(response.json()['events']) == 1
+
+    @pytest.mark.django_db
+    def test_user_loaded_from_database(self, client_one, sales_member_one):
+        """A revoked token falls back to the async ORM for the user."""
+
+        token = self.login(username="sales1", password="vente1111")
+        bump_user_version([sales_member_one.id])
+
+        response = self.async_get(reverse('async-client-list'), token)
+
+        assert response.status_code == 200
+        assert response.json()['count'] == 1
+
+    @pytest.mark.django_db
+    def test_filter_checked_against_database(
+        self, contract_one, client_one, sales_member_one
+    ):
+        """A filter querying the database runs in a thread."""
+
+        token = self.login(username="sales1", password="vente1111")
+
+        response = self.async_get(
+            reverse('async-contract-list') + f'?client={client_one.id}',
+            token,
+        )
+
+        assert response.status_code == 200
+        assert response.json()['count'] == 1
+
+    @pytest.mark.django_db
+    def test_errors(self, sales_member_one):
+        """Missing or invalid tokens and missing objects."""
+
+        token = self.login(username="sales1", password="vente1111")
+
+        assert self.async_get(reverse('async-event-list')).status_code == 401
+        assert (
+            self.async_get(reverse('async-event-list'), 'invalid').status_code
+            == 401
+        )
+        response = self.async_get(
+            reverse('async-event-detail', args=[404]), token
+        )
+        assert response.status_code == 404
+
+    @pytest.mark.django_db
+    def test_queries_are_profiled(self, client_one, sales_member_one):
+        """The queries run in the sync_to_async threads are profiled."""
+
+        token = self.login(username="sales1", password="vente1111")
+
+        response = self.async_get(reverse('async-client-list'), token)
+
+        # count, page
+        assert 'desc="2 queries"' in response['Server-Timing']
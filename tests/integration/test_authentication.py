@@ -0,0 +1,89 @@
+import pytest
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from django.contrib.auth.models import Group, Permission
+from django.urls import reverse
+
+from crm.users.authentication import StatelessJWTAuthentication
+
+
+class TestStatelessAuthentication:
+    client = APIClient()
+
+    def login(self, username, password):
+        credentials = {"username": username, "password": password}
+        response_login = self.client.post(reverse('login'), credentials)
+        token = response_login.data['access']
+
+        return token
+
+    @pytest.mark.django_db
+    def test_list_without_user_query(
+        self, client_one, sales_member_one, django_assert_num_queries
+    ):
+        """A read request builds the user from the token claims."""
+
+        token = self.login(username="sales1", password="vente1111")
+
+        # count, page
+        with django_assert_num_queries(2):
+            response = self.client.get(
+                reverse('client-list'), HTTP_AUTHORIZATION=f'Bearer {token}'
+            )
+
+        assert response.status_code == 200
+        assert response.data['count'] == 1
+
+    @pytest.mark.django_db
+    def test_claims_are_revoked_when_groups_change(
+        self, client_one, sales_member_one
+    ):
+        """A token issued before a group change falls back to the database."""
+
+        token = self.login(username="sales1", password="vente1111")
+        sales_member_one.groups.clear()
+        Group.objects.get_or_create(name='Support')[0].user_set.add(
+            sales_member_one
+        )
+
+        response = self.client.get(
+            reverse('client-list'), HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+
+        assert response.status_code == 200
+        assert response.data['count'] == 0
+
+    @pytest.mark.django_db
+    def test_claims_are_revoked_for_inactive_user(self, sales_member_one):
+        """A deactivated user is rejected despite a valid token."""
+
+        token = self.login(username="sales1", password="vente1111")
+        sales_member_one.is_active = False
+        sales_member_one.save()
+
+        response = self.client.get(
+            reverse('client-list'), HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+
+        assert response.status_code == 401
+
+    @pytest.mark.django_db
+    def test_claims_are_revoked_when_group_permissions_change(
+        self, sales_member_one
+    ):
+        """The permissions claim is not trusted after a permission of one
+        of the groups of the user changes."""
+
+        token = AccessToken(
+            self.login(username="sales1", password="vente1111")
+        )
+        authentication = StatelessJWTAuthentication()
+        assert authentication.has_valid_claims(token)
+
+        sales_group = sales_member_one.groups.get()
+        sales_group.permissions.remove(
+            Permission.objects.get(codename='add_client')
+        )
+
+        assert not authentication.has_valid_claims(token)
@@ -0,0 +1,263 @@
+import pytest
+from rest_framework.test import APIClient
+
+from django.contrib.auth.models import Permission
+from django.urls import reverse
+
+from crm.events.models import Client, Contract, Event
+
+
+class TestBulk:
+    client = APIClient()
+
+    def login(self, username, password):
+        credentials = {"username": username, "password": password}
+        response_login = self.client.post(reverse('login'), credentials)
+        token = response_login.data['access']
+
+        return token
+
+    def client_data(self, number):
+        return [
+            {
+                'first_name': f'first{i}',
+                'last_name': f'last{i}',
+                'email': f'client{i}@test.com',
+                'phone': '0222222222',
+                'mobile': '0622222222',
+                'company_name': f'company {i}',
+            }
+            for i in range(number)
+        ]
+
+    def event_data(self, client, support_contact, number):
+        return [
+            {
+                'client': client.id,
+                'support_contact': support_contact.id,
+                'attendees': i,
+                'event_date': '2023-02-28',
+                'notes': 'test',
+            }
+            for i in range(number)
+        ]
+
+    @pytest.mark.django_db
+    def test_bulk_create_clients(self, sales_member_one):
+        """A sales member can create several clients at once."""
+
+        token = self.login(username="sales1", password="vente1111")
+
+        response = self.client.post(
+            reverse('client-list'),
+            self.client_data(3),
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+            format='json',
+        )
+
+        assert response.status_code == 201
+        assert len(response.data) == 3
+        assert all(client['id'] for client in response.data)
+        assert set(
+            Client.objects.values_list('sales_contact', flat=True)
+        ) == {sales_member_one.id}
+
+    @pytest.mark.django_db
+    def test_bulk_create_clients_as_support_member(self, support_member_one):
+        """A support member cannot create clients."""
+
+        token = self.login(username="support1", password="help1111")
+
+        response = self.client.post(
+            reverse('client-list'),
+            self.client_data(3),
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+            format='json',
+        )
+
+        assert response.status_code == 400
+        assert not Client.objects.exists()
+
+    @pytest.mark.django_db
+    def test_bulk_create_events_in_constant_queries(
+        self,
+        client_one,
+        contract_one,
+        support_member_one,
+        django_assert_max_num_queries,
+    ):
+        """The number of queries does not depend on the number of events."""
+
+        token = self.login(username="sales1", password="vente1111")
+
+        with django_assert_max_num_queries(10):
+            response = self.client.post(
+                reverse('event-list'),
+                self.event_data(client_one, support_member_one, 50),
+                HTTP_AUTHORIZATION=f'Bearer {token}',
+                format='json',
+            )
+
+        assert response.status_code == 201
+        assert Event.objects.count() == 50
+
+    @pytest.mark.django_db
+    def test_bulk_create_events_reports_item_errors(
+        self,
+        client_one,
+        client_two,
+        contract_one,
+        contract_two,
+        support_member_one,
+    ):
+        """Nothing is created if one item is invalid
+        and the errors are reported per item."""
+
+        token = self.login(username="sales1", password="vente1111")
+        data = self.event_data(client_one, support_member_one, 1)
+        data += self.event_data(client_two, support_member_one, 1)
+        data += [{'client': client_one.id}]
+
+        response = self.client.post(
+            reverse('event-list'),
+            data,
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+            format='json',
+        )
+
+        assert response.status_code == 400
+        assert response.data[0] == {}
+        assert 'attendees' in response.data[2]
+        assert not Event.objects.exists()
+
+        response = self.client.post(
+            reverse('event-list'),
+            data[:2],
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+            format='json',
+        )
+
+        assert response.status_code == 400
+        assert response.data == [
+            {},
+            {
+                'detail': "You're not allowed because the client "
+                "doesn't have active contract."
+            },
+        ]
+        assert not Event.objects.exists()
+
+    @pytest.mark.django_db
+    def test_bulk_update_contracts(
+        self, client_one, client_two, contract_one, contract_two
+    ):
+        """Several contracts can be updated at once and the active
+        contract flag of their clients follows."""
+
+        token = self.login(username="sales1", password="vente1111")
+        data = [
+            {
+                'id': contract.id,
+                'client': contract.client_id,
+                'signed_status': not contract.signed_status,
+                'amount': 200.0,
+                'payment_due': '2023-03-31',
+            }
+            for contract in (contract_one, contract_two)
+        ]
+
+        response = self.client.put(
+            reverse('contract-list'),
+            data,
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+            format='json',
+        )
+
+        assert response.status_code == 200
+        assert set(Contract.objects.values_list('amount', flat=True)) == {
+            200.0
+        }
+        assert not Client.objects.get(pk=client_one.id).has_active_contract
+        assert Client.objects.get(pk=client_two.id).has_active_contract
+
+    @pytest.mark.django_db
+    def test_not_bulk_update_clients_of_another_sales_member(
+        self, client_one, sales_member_two
+    ):
+        """A sales member cannot update the clients of someone else."""
+
+        token = self.login(username="sales2", password="vente2222")
+        data = self.client_data(1)
+        data[0]['id'] = client_one.id
+
+        response = self.client.put(
+            reverse('client-list'),
+            data,
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+            format='json',
+        )
+
+        assert response.status_code == 400
+        assert response.data == [{'detail': 'Not found.'}]
+        assert Client.objects.get(pk=client_one.id).last_name == 'idilbi'
+
+    @pytest.mark.django_db
+    def test_bulk_update_converts_the_ids(self, client_one, sales_member_one):
+        """An id given as a string is found, a missing or invalid one is
+        reported on the item."""
+
+        token = self.login(username="sales1", password="vente1111")
+        data = self.client_data(3)
+        data[0]['id'] = str(client_one.id)
+        data[1]['id'] = 'x'
+
+        response = self.client.put(
+            reverse('client-list'),
+            data,
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+            format='json',
+        )
+
+        assert response.status_code == 400
+        assert response.data[0] == {}
+        assert list(response.data[1]) == ['id']
+        assert response.data[2] == {'id': ['This field is required.']}
+
+        response = self.client.put(
+            reverse('client-list'),
+            data[:1],
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+            format='json',
+        )
+
+        assert response.status_code == 200
+        assert Client.objects.get(pk=client_one.id).last_name == 'last0'
+
+    @pytest.mark.django_db
+    def test_bulk_update_contracts_needs_change_contract(
+        self, contract_one, sales_member_one
+    ):
+        """The bulk update of contracts checks the contract permission."""
+
+        permission = Permission.objects.get(codename='change_contract')
+        sales_member_one.groups.get().permissions.remove(permission)
+        token = self.login(username="sales1", password="vente1111")
+        data = [
+            {
+                'id': contract_one.id,
+                'client': contract_one.client_id,
+                'signed_status': True,
+                'amount': 200.0,
+                'payment_due': '2023-03-31',
+            }
+        ]
+
+        response = self.client.put(
+            reverse('contract-list'),
+            data,
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+            format='json',
+        )
+
+        assert response.status_code == 400
+        assert Contract.objects.get(pk=contract_one.id).amount == 100.0
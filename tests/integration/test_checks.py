@@ -0,0 +1,60 @@
+from crm.events.checks import check_response_cache
+from crm.users.checks import check_replicas_cache, check_users_cache
+
+
+class TestChecks:
+    def test_process_local_cache_is_rejected(self, settings):
+        """The user versions need a cache shared by the workers."""
+
+        settings.CACHES = {
+            **settings.CACHES,
+            'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'
+            },
+        }
+
+        errors = check_users_cache(None)
+
+        assert [error.id for error in errors] == ['crm.E001']
+
+    def test_shared_cache_is_accepted(self):
+        """The default settings use a cache shared by the workers."""
+
+        assert check_users_cache(None) == []
+
+    def test_process_local_pins_cache_is_rejected(self, settings):
+        """With replicas, the pins need a cache shared by the workers."""
+
+        settings.CACHES = {
+            **settings.CACHES,
+            'pins': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'
+            },
+        }
+        settings.CRM_REPLICAS = {'ALIASES': [], 'CACHE_ALIAS': 'pins'}
+        assert check_replicas_cache(None) == []
+
+        settings.CRM_REPLICAS = {
+            'ALIASES': ['replica1'],
+            'CACHE_ALIAS': 'pins',
+        }
+        errors = check_replicas_cache(None)
+
+        assert [error.id for error in errors] == ['crm.E001']
+
+    def test_process_local_response_cache_is_rejected(self, settings):
+        """The cached lists need a cache shared by the workers."""
+
+        settings.CACHES = {
+            **settings.CACHES,
+            'responses': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'
+            },
+        }
+
+        errors = check_response_cache(None)
+
+        assert [error.id for error in errors] == ['crm.E001']
+
+        settings.CRM_RESPONSE_CACHE = {'ALIAS': None}
+        assert check_response_cache(None) == []
@@ -0,0 +1,244 @@
+import pytest
+from rest_framework.test import APIClient
+
+from django.urls import reverse
+
+from crm.events.models import Event
+
+
+class TestConditionalGet:
+    client = APIClient()
+
+    def login(self, username, password):
+        credentials = {"username": username, "password": password}
+        response_login = self.client.post(reverse('login'), credentials)
+        token = response_login.data['access']
+
+        return token
+
+    @pytest.mark.django_db
+    def test_list_not_modified(
+        self,
+        event_one,
+        support_member_one,
+        django_assert_num_queries,
+        settings,
+    ):
+        """A list whose ETag still matches is answered with one query."""
+
+        settings.CRM_RESPONSE_CACHE = {'ALIAS': None}
+
+        token = self.login(username="support1", password="help1111")
+        response = self.client.get(
+            reverse('event-list'), HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+        assert response.status_code == 200
+        # The count in the ETag catches the deletions, not Last-Modified.
+        assert not response.has_header('Last-Modified')
+        etag = response['ETag']
+
+        with django_assert_num_queries(1):
+            response = self.client.get(
+                reverse('event-list'),
+                HTTP_AUTHORIZATION=f'Bearer {token}',
+                HTTP_IF_NONE_MATCH=etag,
+            )
+
+        assert response.status_code == 304
+        assert response['ETag'] == etag
+
+    @pytest.mark.django_db
+    def test_list_modified(self, event_one, support_member_one):
+        """Updating or deleting an event changes the ETag of the list."""
+
+        token = self.login(username="support1", password="help1111")
+        etag = self.client.get(
+            reverse('event-list'), HTTP_AUTHORIZATION=f'Bearer {token}'
+        )['ETag']
+
+        event = Event.objects.get(pk=event_one.pk)
+        event.attendees += 1
+        event.save()
+        response = self.client.get(
+            reverse('event-list'),
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+
+        etag = response['ETag']
+        event.delete()
+        response = self.client.get(
+            reverse('event-list'),
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        assert response.status_code == 200
+
+    @pytest.mark.django_db
+    def test_detail_follows_nested_objects(
+        self, client_one, contract_one, sales_member_one
+    ):
+        """The ETag of a client detail covers its nested contracts."""
+
+        token = self.login(username="sales1", password="vente1111")
+        url = reverse('client-detail', args=[client_one.id])
+        etag = self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}')[
+            'ETag'
+        ]
+
+        response = self.client.get(
+            url, HTTP_AUTHORIZATION=f'Bearer {token}', HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == 304
+
+        contract_one.amount += 1
+        contract_one.save()
+        response = self.client.get(
+            url, HTTP_AUTHORIZATION=f'Bearer {token}', HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == 200
+        assert response.data['contracts'][0]['amount'] == contract_one.amount
+
+    @pytest.mark.django_db
+    def test_support_detail_follows_all_nested_events(
+        self, event_one, support_member_two, settings
+    ):
+        """The client of a support member nests the events of the other
+        support members, so its ETag covers them too."""
+
+        settings.CRM_RESPONSE_CACHE = {'ALIAS': None}
+        event_two = Event.objects.create(
+            client=event_one.client,
+            support_contact=support_member_two,
+            attendees=10,
+            event_date="2023-03-01",
+        )
+        token = self.login(username="support1", password="help1111")
+        url = reverse('client-detail', args=[event_one.client_id])
+        etag = self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}')[
+            'ETag'
+        ]
+
+        event_two.attendees += 1
+        event_two.save()
+        response = self.client.get(
+            url, HTTP_AUTHORIZATION=f'Bearer {token}', HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == 200
+        assert len(response.data['events']) == 2
+
+        etag = response['ETag']
+        Event.objects.create(
+            client=event_one.client,
+            support_contact=support_member_two,
+            attendees=10,
+            event_date="2023-03-02",
+        )
+        response = self.client.get(
+            url, HTTP_AUTHORIZATION=f'Bearer {token}', HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == 200
+        assert len(response.data['events']) == 3
+
+    @pytest.mark.django_db
+    def test_bulk_update_changes_etag(self, client_one, sales_member_one):
+        """bulk_update sets last_modified like save()."""
+
+        token = self.login(username="sales1", password="vente1111")
+        etag = self.client.get(
+            reverse('client-list'), HTTP_AUTHORIZATION=f'Bearer {token}'
+        )['ETag']
+
+        data = [
+            {
+                'id': client_one.id,
+                'first_name': 'sam',
+                'last_name': 'renamed',
+                'email': 'sam@test.com',
+                'phone': '0222222222',
+                'mobile': '0622222222',
+                'company_name': 'company one',
+            }
+        ]
+        response = self.client.put(
+            reverse('client-list'),
+            data,
+            format='json',
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+        )
+        assert response.status_code == 200
+
+        response = self.client.get(
+            reverse('client-list'),
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        assert response.status_code == 200
+
+    @pytest.mark.django_db
+    def test_missing_object_is_not_found(self, sales_member_one):
+        """A missing object is not answered 304 by `If-None-Match: *`."""
+
+        token = self.login(username="sales1", password="vente1111")
+
+        response = self.client.get(
+            reverse('client-detail', args=[404]),
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+            HTTP_IF_NONE_MATCH='*',
+        )
+
+        assert response.status_code == 404
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('query', ['?count=false', '?pagination=cursor'])
+    def test_uncounted_list_has_no_validators(
+        self,
+        event_one,
+        support_member_one,
+        django_assert_num_queries,
+        settings,
+        query,
+    ):
+        """A list paginated without count runs no aggregate query."""
+
+        settings.CRM_RESPONSE_CACHE = {'ALIAS': None}
+        token = self.login(username="support1", password="help1111")
+
+        # page
+        with django_assert_num_queries(1):
+            response = self.client.get(
+                reverse('event-list') + query,
+                HTTP_AUTHORIZATION=f'Bearer {token}',
+            )
+
+        assert response.status_code == 200
+        assert len(response.data['results']) == 1
+        assert not response.has_header('ETag')
+
+    @pytest.mark.django_db
+    def test_list_ignores_if_modified_since(
+        self, event_one, support_member_one, settings
+    ):
+        """A deletion does not move the latest last_modified, so the lists
+        are not answered 304 from If-Modified-Since."""
+
+        settings.CRM_RESPONSE_CACHE = {'ALIAS': None}
+        token = self.login(username="support1", password="help1111")
+        Event.objects.create(
+            client=event_one.client,
+            support_contact=support_member_one,
+            attendees=10,
+            event_date="2023-03-01",
+        )
+        event_one.delete()
+
+        response = self.client.get(
+            reverse('event-list'),
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+            HTTP_IF_MODIFIED_SINCE='Fri, 31 Dec 2100 00:00:00 GMT',
+        )
+
+        assert response.status_code == 200
+        assert response.data['count'] == 1
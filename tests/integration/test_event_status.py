@@ -0,0 +1,72 @@
+import pytest
+
+from crm.events.models import Event, EventStatus
+
+
+class TestDefaultEventStatus:
+    @pytest.mark.django_db
+    def test_default_status_is_created_by_migration(self):
+        """The default status row exists without any event."""
+
+        assert EventStatus.objects.filter(status=False).exists()
+
+    @pytest.mark.django_db
+    def test_default_status_is_resolved_once(
+        self, client_one, support_member_one, django_assert_num_queries
+    ):
+        """Building events does not query the default status."""
+
+        EventStatus.get_default_pk()
+
+        with django_assert_num_queries(0):
+            events = [
+                Event(
+                    client=client_one,
+                    support_contact=support_member_one,
+                    attendees=10,
+                    event_date='2023-02-25',
+                )
+                for i in range(100)
+            ]
+
+        default_status = EventStatus.objects.get(status=False)
+        assert {event.event_status_id for event in events} == {
+            default_status.pk
+        }
+
+    @pytest.mark.django_db
+    def test_deleted_default_status_is_created_again(
+        self, client_one, support_member_one
+    ):
+        """Deleting the default status does not leave its pk resolved."""
+
+        EventStatus.get_default_pk()
+        EventStatus.objects.filter(status=False).delete()
+
+        event = Event.objects.create(
+            client=client_one,
+            support_contact=support_member_one,
+            attendees=10,
+            event_date='2023-02-25',
+        )
+
+        assert event.event_status == EventStatus.objects.get(status=False)
+
+    @pytest.mark.django_db
+    def test_created_default_status_resolved_once_committed(
+        self, django_capture_on_commit_callbacks, monkeypatch
+    ):
+        """A default status created in a transaction rolled back is not
+        resolved."""
+
+        # Restored after the test, whose transaction is rolled back.
+        monkeypatch.setattr(EventStatus, '_default_pk', None)
+        EventStatus.objects.filter(status=False).delete()
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            default_pk = EventStatus.get_default_pk()
+        assert EventStatus._default_pk is None
+
+        for callback in callbacks:
+            callback()
+        assert EventStatus._default_pk == default_pk
@@ -0,0 +1,91 @@
+import pytest
+from rest_framework.test import APIClient
+
+from django.urls import reverse
+
+from crm.events.models import Client, Contract, Event
+
+
+class TestExpandClients:
+    client = APIClient()
+
+    def login(self, username, password):
+        credentials = {"username": username, "password": password}
+        response_login = self.client.post(reverse('login'), credentials)
+        token = response_login.data['access']
+
+        return token
+
+    def create_clients(self, sales_contact, support_contact, number):
+        for i in range(number):
+            client = Client.objects.create(
+                sales_contact=sales_contact,
+                first_name=f'first{i}',
+                last_name=f'last{i}',
+                email=f'client{i}@test.com',
+                phone='0222222222',
+                mobile='0622222222',
+                company_name=f'company {i}',
+            )
+            Contract.objects.create(
+                sales_contact=sales_contact,
+                client=client,
+                signed_status=True,
+                amount=100.0,
+                payment_due="2023-02-28",
+            )
+            Event.objects.create(
+                client=client,
+                support_contact=support_contact,
+                attendees=10,
+                event_date="2023-02-25",
+            )
+
+    def list_clients(self, token, limit):
+        return self.client.get(
+            reverse('client-list') + f'?expand=events,contracts&limit={limit}',
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+        )
+
+    @pytest.mark.django_db
+    def test_list_clients_with_expand(
+        self,
+        sales_member_one,
+        support_member_one,
+        django_assert_num_queries,
+        settings,
+    ):
+        """The expanded relations are rendered with a constant number
+        of queries whatever the number of clients on the page."""
+
+        settings.CRM_RESPONSE_CACHE = {'ALIAS': None}
+
+        self.create_clients(sales_member_one, support_member_one, 6)
+        token = self.login(username="sales1", password="vente1111")
+        self.list_clients(token, 2)
+
+        # count, page, events, contracts
+        with django_assert_num_queries(4):
+            response = self.list_clients(token, 2)
+        assert len(response.data['results']) == 2
+
+        with django_assert_num_queries(4):
+            response = self.list_clients(token, 6)
+        assert len(response.data['results']) == 6
+        for client in response.data['results']:
+            assert len(client['events']) == 1
+            assert len(client['contracts']) == 1
+            assert client['events'][0]['client'] == client['id']
+
+    @pytest.mark.django_db
+    def test_list_clients_without_expand(self, client_one, sales_member_one):
+        """The relations are not rendered by default."""
+
+        token = self.login(username="sales1", password="vente1111")
+
+        response = self.client.get(
+            reverse('client-list'), HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+
+        assert 'events' not in response.data['results'][0]
+        assert 'contracts' not in response.data['results'][0]
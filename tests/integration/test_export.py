@@ -0,0 +1,100 @@
+import csv
+import io
+import json
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.urls import reverse
+
+from crm.events.models import Contract
+
+
+class TestExport:
+    client = APIClient()
+
+    def login(self, username, password):
+        credentials = {"username": username, "password": password}
+        response_login = self.client.post(reverse('login'), credentials)
+        token = response_login.data['access']
+
+        return token
+
+    def export(self, url_name, token, query=''):
+        return self.client.get(
+            reverse(url_name) + query, HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+
+    @pytest.mark.django_db
+    def test_contracts_csv(
+        self, contract_one, contract_two, sales_member_one, sales_member_two
+    ):
+        """The contracts of the sales member are streamed as CSV."""
+
+        Contract.objects.filter(pk=contract_two.pk).update(
+            sales_contact=sales_member_two
+        )
+        token = self.login(username="sales1", password="vente1111")
+
+        response = self.export('contract-export', token)
+
+        assert response.status_code == 200
+        assert response.streaming
+        assert response['Content-Type'] == 'text/csv'
+        assert 'contracts.csv' in response['Content-Disposition']
+        content = b''.join(response.streaming_content).decode()
+        rows = list(csv.reader(io.StringIO(content)))
+        assert rows[0] == [
+            'id',
+            'sales_contact',
+            'client',
+            'date_created',
+            'date_updated',
+            'signed_status',
+            'amount',
+            'payment_due',
+        ]
+        assert len(rows) == 2
+        assert rows[1][0] == str(contract_one.id)
+        assert rows[1][7] == '2023-02-28'
+
+    @pytest.mark.django_db
+    def test_contracts_filtered(
+        self, contract_one, contract_two, sales_member_one
+    ):
+        """The export applies the filters of the list."""
+
+        token = self.login(username="sales1", password="vente1111")
+
+        response = self.export(
+            'contract-export', token, '?file_format=ndjson&last_name=lepar'
+        )
+
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert [json.loads(line)['id'] for line in lines] == [contract_two.id]
+
+    @pytest.mark.django_db
+    def test_events_ndjson(self, event_one, support_member_one):
+        """The events of the support member are streamed as NDJSON."""
+
+        token = self.login(username="support1", password="help1111")
+
+        response = self.export('event-export', token, '?file_format=ndjson')
+
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert len(lines) == 1
+        event = json.loads(lines[0])
+        assert event['id'] == event_one.id
+        assert event['event_date'] == '2023-02-25'
+        assert event['notes'] == "évènement de test"
+
+    @pytest.mark.django_db
+    def test_unknown_format(self, sales_member_one):
+        """Only CSV and NDJSON are supported."""
+
+        token = self.login(username="sales1", password="vente1111")
+
+        response = self.export('event-export', token, '?file_format=xlsx')
+
+        assert response.status_code == 400
@@ -0,0 +1,89 @@
+import pytest
+
+from django.db import connection
+
+from crm.events.models import Client, Contract, Event
+
+
+@pytest.fixture
+def explain():
+    """Return the query plan of a queryset.
+
+    PostgreSQL prefers a sequential scan on tiny tables, so it is
+    disabled to check which index the planner would pick.
+    """
+
+    def _explain(queryset):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+    return _explain
+
+
+class TestIndexes:
+    @pytest.mark.django_db
+    @pytest.mark.parametrize(
+        'field, index',
+        [('email', 'client_email_idx'), ('last_name', 'client_last_name_idx')],
+    )
+    def test_client_filters_use_index(self, explain, client_one, field, index):
+        """The client filters of ClientViewset use an index."""
+
+        queryset = Client.objects.filter(**{field: getattr(client_one, field)})
+
+        assert index in explain(queryset)
+
+    @pytest.mark.django_db
+    def test_client_list_uses_index(self, explain, sales_member_one):
+        """Listing the clients of a sales member uses an index."""
+
+        queryset = Client.objects.filter(
+            sales_contact=sales_member_one.id
+        ).order_by('-date_created', '-id')
+
+        assert 'client_sales_created_idx' in explain(queryset)
+
+    @pytest.mark.django_db
+    def test_active_contract_check_uses_index(self, explain, client_one):
+        """The active contract check uses an index on signed contracts."""
+
+        queryset = Contract.objects.filter(
+            client=client_one, signed_status=True
+        )
+
+        assert 'contract_client_signed_idx' in explain(queryset)
+
+    @pytest.mark.django_db
+    def test_contract_client_indexed_once(self):
+        """The client of the contracts has a single index, which leads
+        with it."""
+
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, Contract._meta.db_table
+            )
+        client_indexes = [
+            name
+            for name, constraint in constraints.items()
+            if constraint['index']
+            and not constraint['primary_key']
+            and constraint['columns'][:1] == ['client_id']
+        ]
+
+        assert client_indexes == ['contract_client_signed_idx']
+
+    @pytest.mark.django_db
+    def test_event_filters_use_index(self, explain, support_member_one):
+        """The event filters of EventViewset use an index."""
+
+        plan = explain(Event.objects.filter(event_date='2023-02-25'))
+
+        assert 'event_date_idx' in plan
+
+        queryset = Event.objects.filter(
+            support_contact=support_member_one, event_date='2023-02-25'
+        )
+
+        assert 'event_support_date_idx' in explain(queryset)
@@ -0,0 +1,34 @@
+import json
+import logging
+
+from crm.log import JsonFormatter, QueueListenerHandler, SamplingFilter
+
+
+class TestLogging:
+    def make_record(self, level, message):
+        return logging.LogRecord(
+            'crm.events.views', level, __file__, 1, message, None, None
+        )
+
+    def test_sampling_filter_only_drops_debug(self):
+        """The sampling only applies to DEBUG records."""
+
+        sampling = SamplingFilter(rate=0)
+
+        assert not sampling.filter(self.make_record(logging.DEBUG, 'GET'))
+        assert sampling.filter(self.make_record(logging.INFO, 'GET'))
+
+    def test_queue_handler_writes_json_lines(self, tmp_path):
+        """The records are written as JSON by the listener thread."""
+
+        filename = tmp_path / 'general.log'
+        handler = QueueListenerHandler(filename)
+        handler.setFormatter(JsonFormatter())
+
+        handler.handle(self.make_record(logging.INFO, 'POST client: OK'))
+        handler.close()
+
+        line = json.loads(filename.read_text())
+        assert line['message'] == 'POST client: OK'
+        assert line['logger'] == 'crm.events.views'
+        assert line['level'] == 'INFO'
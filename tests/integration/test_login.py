@@ -0,0 +1,64 @@
+import threading
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.urls import reverse
+
+from crm.users import hashing
+
+
+class TestLogin:
+    client = APIClient()
+
+    @pytest.mark.django_db
+    def test_login_runs_four_queries(
+        self, sales_member_one, django_assert_num_queries
+    ):
+        """A login looks the user up with a single query, then loads the
+        claims of the token: the group names, the user permissions and
+        the group permissions."""
+
+        credentials = {"username": "sales1", "password": "vente1111"}
+
+        with django_assert_num_queries(4):
+            response = self.client.post(reverse('login'), credentials)
+
+        assert response.status_code == 200
+        assert 'access' in response.data
+
+    @pytest.mark.django_db
+    def test_login_with_unknown_user(self, django_assert_num_queries):
+        """An unknown user is rejected after the dummy hash."""
+
+        credentials = {"username": "nobody", "password": "vente1111"}
+
+        with django_assert_num_queries(1):
+            response = self.client.post(reverse('login'), credentials)
+
+        assert response.status_code == 400
+        assert response.data['message'] == 'User Does Not Exist'
+
+    @pytest.mark.django_db
+    def test_login_with_invalid_password(self, sales_member_one):
+        """A wrong password is rejected."""
+
+        credentials = {"username": "sales1", "password": "wrong"}
+
+        response = self.client.post(reverse('login'), credentials)
+
+        assert response.status_code == 400
+        assert response.data['message'] == 'Invalid Password'
+
+    @pytest.mark.django_db
+    def test_login_when_hashing_pool_is_full(
+        self, sales_member_one, monkeypatch
+    ):
+        """Logins are refused when too many hashes are pending."""
+
+        monkeypatch.setattr(hashing, '_slots', threading.Semaphore(0))
+        credentials = {"username": "sales1", "password": "vente1111"}
+
+        response = self.client.post(reverse('login'), credentials)
+
+        assert response.status_code == 503
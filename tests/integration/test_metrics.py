@@ -0,0 +1,111 @@
+import json
+import os
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.urls import reverse
+
+from crm.metrics import JWT_DECODE_DURATION, registry
+
+
+def get_sample(text, sample):
+    """Return the value of a sample of the /metrics output (0 if missing)."""
+    for line in text.splitlines():
+        if line.startswith(sample + ' '):
+            return float(line.rsplit(' ', 1)[1])
+    return 0
+
+
+class TestMetrics:
+    client = APIClient()
+
+    def login(self, username, password):
+        credentials = {"username": username, "password": password}
+        response_login = self.client.post(reverse('login'), credentials)
+        token = response_login.data['access']
+
+        return token
+
+    def scrape(self):
+        response = self.client.get(reverse('metrics'))
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain')
+        return response.content.decode()
+
+    @pytest.mark.django_db
+    def test_request_and_db_duration(self, client_one, sales_member_one):
+        """Each request is counted by viewset and action."""
+
+        request_sample = (
+            'crm_request_duration_seconds_count'
+            '{view="ClientViewset",action="list",status="200"}'
+        )
+        db_sample = (
+            'crm_db_duration_seconds_count'
+            '{view="ClientViewset",action="list"}'
+        )
+        before = self.scrape()
+        token = self.login(username="sales1", password="vente1111")
+
+        self.client.get(
+            reverse('client-list'), HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+
+        after = self.scrape()
+        assert get_sample(after, request_sample) == (
+            get_sample(before, request_sample) + 1
+        )
+        assert (
+            get_sample(after, db_sample) == get_sample(before, db_sample) + 1
+        )
+        assert '# TYPE crm_request_duration_seconds histogram' in after
+
+    @pytest.mark.django_db
+    def test_auth_and_pagination(self, client_one, sales_member_one):
+        """Password hashing, token decoding and page offsets are recorded."""
+
+        before = self.scrape()
+        token = self.login(username="sales1", password="vente1111")
+
+        self.client.get(
+            reverse('client-list') + '?offset=4',
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+        )
+
+        after = self.scrape()
+        for sample in (
+            'crm_password_hash_seconds_count',
+            'crm_jwt_decode_seconds_count',
+            'crm_pagination_offset_count{view="ClientViewset"}',
+        ):
+            assert get_sample(after, sample) == get_sample(before, sample) + 1
+        offset_bucket = (
+            'crm_pagination_offset_bucket{view="ClientViewset",le="10"}'
+        )
+        assert get_sample(after, offset_bucket) >= 1
+
+    def test_workers_are_summed(self, settings, tmp_path):
+        """The files written by the other workers are added to the
+        process histograms."""
+
+        settings.CRM_METRICS = {
+            'DIRECTORY': str(tmp_path),
+            'FLUSH_INTERVAL': 0,
+        }
+        JWT_DECODE_DURATION.observe(0.0002)
+        assert (tmp_path / f'{os.getpid()}.json').exists()
+
+        own = registry.collect()['crm_jwt_decode_seconds'][()]
+        buckets = len(JWT_DECODE_DURATION.buckets)
+        other_worker = {
+            'crm_jwt_decode_seconds': [
+                [[], {'buckets': [3] * buckets, 'sum': 0.5, 'count': 3}]
+            ]
+        }
+        (tmp_path / '1.json').write_text(json.dumps(other_worker))
+
+        merged = registry.collect()['crm_jwt_decode_seconds'][()]
+        assert merged['count'] == own['count'] + 3
+        assert merged['sum'] == pytest.approx(own['sum'] + 0.5)
+        assert merged['buckets'] == [count + 3 for count in own['buckets']]
@@ -0,0 +1,97 @@
+import pytest
+from rest_framework.test import APIClient
+
+from django.urls import reverse
+
+from crm.events.models import Event
+
+
+class TestObjectPermissionQueries:
+    client = APIClient()
+
+    def login(self, username, password):
+        credentials = {"username": username, "password": password}
+        response_login = self.client.post(reverse('login'), credentials)
+        token = response_login.data['access']
+
+        return token
+
+    def create_events(self, client, support_contact, number):
+        return Event.objects.bulk_create(
+            Event(
+                client=client,
+                support_contact=support_contact,
+                attendees=i,
+                event_date='2023-02-25',
+            )
+            for i in range(number)
+        )
+
+    def event_data(self, event):
+        return {
+            'id': event.id,
+            'client': event.client_id,
+            'support_contact': event.support_contact_id,
+            'attendees': 200,
+            'event_date': '2023-03-01',
+            'event_status': event.event_status_id,
+            'notes': 'test',
+        }
+
+    @pytest.mark.django_db
+    def test_update_event_as_sales_member(
+        self,
+        event_one,
+        sales_member_one,
+        support_member_one,
+        django_assert_num_queries,
+    ):
+        """Checking the sales contact of the event loads no related row."""
+
+        token = self.login(username="sales1", password="vente1111")
+        self.client.get(
+            reverse('event-list'), HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+
+        # user, event with its client, client, support contact,
+        # event status, update, contacts of the cached lists and sales
+        # summary (computed and stored)
+        with django_assert_num_queries(9):
+            response = self.client.put(
+                reverse('event-detail', args=[event_one.id]),
+                self.event_data(event_one),
+                HTTP_AUTHORIZATION=f'Bearer {token}',
+                format='json',
+            )
+
+        assert response.status_code == 201
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('number', [2, 20])
+    def test_bulk_update_events_as_support_member(
+        self,
+        client_one,
+        support_member_one,
+        django_assert_num_queries,
+        number,
+    ):
+        """The object permissions of many events cost no query."""
+
+        events = self.create_events(client_one, support_member_one, number)
+        token = self.login(username="support1", password="help1111")
+        self.client.get(
+            reverse('event-list'), HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+
+        # user, events, clients, support contacts, event status,
+        # savepoint, update, contacts of the cached lists, sales summary
+        # (computed and stored) and release
+        with django_assert_num_queries(11):
+            response = self.client.put(
+                reverse('event-list'),
+                [self.event_data(event) for event in events],
+                HTTP_AUTHORIZATION=f'Bearer {token}',
+                format='json',
+            )
+
+        assert response.status_code == 200
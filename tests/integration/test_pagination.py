@@ -0,0 +1,125 @@
+from base64 import b64encode
+from urllib.parse import urlencode
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.urls import reverse
+
+from crm.events.models import Client
+
+
+class TestPagination:
+    client = APIClient()
+
+    def login(self, username, password):
+        credentials = {"username": username, "password": password}
+        response_login = self.client.post(reverse('login'), credentials)
+        token = response_login.data['access']
+
+        return token
+
+    def create_clients(self, sales_contact, number):
+        return Client.objects.bulk_create(
+            Client(
+                sales_contact=sales_contact,
+                first_name=f'first{i}',
+                last_name=f'last{i}',
+                email=f'client{i}@test.com',
+                phone='0222222222',
+                mobile='0622222222',
+                company_name=f'company {i}',
+            )
+            for i in range(number)
+        )
+
+    @pytest.mark.django_db
+    def test_list_clients_with_cursor(self, sales_member_one):
+        """The cursor mode walks every client once, forwards and backwards."""
+
+        self.create_clients(sales_member_one, 10)
+        token = self.login(username="sales1", password="vente1111")
+
+        url = reverse('client-list') + '?pagination=cursor&page_size=3'
+        pages = []
+        while url:
+            response = self.client.get(
+                url, HTTP_AUTHORIZATION=f'Bearer {token}'
+            )
+            assert response.status_code == 200
+            assert 'count' not in response.data
+            pages.append([client['id'] for client in response.data['results']])
+            url = response.data['next']
+
+        ids = [pk for page in pages for pk in page]
+        expected = list(
+            Client.objects.order_by('-date_created', '-id').values_list(
+                'id', flat=True
+            )
+        )
+        assert ids == expected
+        assert [len(page) for page in pages] == [3, 3, 3, 1]
+
+        response = self.client.get(
+            response.data['previous'], HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+        assert [
+            client['id'] for client in response.data['results']
+        ] == pages[-2]
+
+    @pytest.mark.django_db
+    def test_list_clients_without_count(self, sales_member_one):
+        """The limit/offset mode can skip the count query."""
+
+        self.create_clients(sales_member_one, 5)
+        token = self.login(username="sales1", password="vente1111")
+
+        response = self.client.get(
+            reverse('client-list') + '?count=false&limit=4',
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+        )
+
+        assert 'count' not in response.data
+        assert len(response.data['results']) == 4
+        assert 'offset=4' in response.data['next']
+
+        response = self.client.get(
+            response.data['next'], HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+
+        assert len(response.data['results']) == 1
+        assert response.data['next'] is None
+
+    @pytest.mark.django_db
+    def test_list_clients_with_invalid_cursor(self, sales_member_one):
+        """An invalid cursor is rejected."""
+
+        token = self.login(username="sales1", password="vente1111")
+
+        response = self.client.get(
+            reverse('client-list') + '?cursor=invalid',
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+        )
+
+        assert response.status_code == 404
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize(
+        'querystring', ['p=garbage&o=1', 'p=2023-02-25&o=x', 'p=&o=1']
+    )
+    def test_list_clients_with_crafted_cursor(
+        self, client_one, sales_member_one, querystring
+    ):
+        """A well encoded cursor whose position does not parse is
+        rejected like an invalid one."""
+
+        token = self.login(username="sales1", password="vente1111")
+        cursor = b64encode(querystring.encode('ascii')).decode('ascii')
+
+        response = self.client.get(
+            reverse('client-list') + '?' + urlencode({'cursor': cursor}),
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+        )
+
+        assert response.status_code == 404
+        assert response.data['detail'] == 'Invalid cursor'
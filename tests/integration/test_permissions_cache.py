@@ -0,0 +1,81 @@
+import pytest
+
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import caches
+
+from crm.users.backends import (
+    GLOBAL_VERSION_CACHE_KEY,
+    bump_global_version,
+    get_global_version,
+    local_cache,
+)
+from crm.users.models import User
+
+
+class TestPermissionsCache:
+    @pytest.mark.django_db
+    def test_permissions_are_cached(
+        self, sales_member_one, django_assert_num_queries
+    ):
+        """A fresh user object checks its permissions without query."""
+
+        User.objects.get(pk=sales_member_one.pk).has_perm('events.add_client')
+        user = User.objects.get(pk=sales_member_one.pk)
+
+        with django_assert_num_queries(0):
+            assert user.has_perm('events.add_client')
+            assert not user.has_perm('events.delete_client')
+
+    @pytest.mark.django_db
+    def test_shared_cache_is_used_by_other_processes(
+        self, sales_member_one, django_assert_num_queries
+    ):
+        """The permissions are found in the shared cache when the
+        process local cache is empty."""
+
+        User.objects.get(pk=sales_member_one.pk).has_perm('events.add_client')
+        local_cache.clear()
+        user = User.objects.get(pk=sales_member_one.pk)
+
+        with django_assert_num_queries(0):
+            assert user.has_perm('events.add_client')
+
+    @pytest.mark.django_db
+    def test_permissions_are_invalidated_on_group_change(
+        self, sales_member_one
+    ):
+        """Removing a permission from a group invalidates the cache."""
+
+        User.objects.get(pk=sales_member_one.pk).has_perm('events.add_client')
+        Group.objects.get(name='Sales').permissions.remove(
+            Permission.objects.get(codename='add_client')
+        )
+
+        user = User.objects.get(pk=sales_member_one.pk)
+
+        assert not user.has_perm('events.add_client')
+
+    @pytest.mark.django_db
+    def test_permissions_are_invalidated_on_user_change(
+        self, sales_member_one
+    ):
+        """Giving a permission to a user invalidates the cache."""
+
+        User.objects.get(pk=sales_member_one.pk).has_perm('events.add_client')
+        sales_member_one.user_permissions.add(
+            Permission.objects.get(codename='delete_client')
+        )
+
+        user = User.objects.get(pk=sales_member_one.pk)
+
+        assert user.has_perm('events.delete_client')
+
+    def test_lost_global_version_does_not_go_back(self):
+        """A global version evicted by the cache does not start again from
+        a version the local caches may hold permissions under."""
+
+        version = get_global_version()
+        bump_global_version()
+        caches['default'].delete(GLOBAL_VERSION_CACHE_KEY)
+
+        assert get_global_version() not in (version, version + 1)
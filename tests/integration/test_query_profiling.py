@@ -0,0 +1,95 @@
+import logging
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.urls import reverse
+
+
+class TestQueryProfiling:
+    client = APIClient()
+
+    def login(self, username, password):
+        credentials = {"username": username, "password": password}
+        response_login = self.client.post(reverse('login'), credentials)
+        token = response_login.data['access']
+
+        return token
+
+    @pytest.mark.django_db
+    def test_server_timing_header(self, client_one, sales_member_one):
+        """The number and duration of the queries are sent back."""
+
+        token = self.login(username="sales1", password="vente1111")
+
+        response = self.client.get(
+            reverse('client-list'), HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+
+        assert response['Server-Timing'].startswith('db;dur=')
+        assert 'desc="2 queries"' in response['Server-Timing']
+
+    @pytest.mark.django_db
+    def test_warning_over_query_budget(
+        self, client_one, sales_member_one, settings, caplog
+    ):
+        """A route over its query budget is logged."""
+
+        settings.CRM_QUERY_BUDGETS = {
+            'DEFAULT': {'QUERIES': 20, 'TIME_MS': 10000},
+            'ROUTES': {'client-list': {'QUERIES': 1}},
+            'DUPLICATE_THRESHOLD': 3,
+        }
+        token = self.login(username="sales1", password="vente1111")
+
+        with caplog.at_level(logging.WARNING, logger='crm.middleware'):
+            self.client.get(
+                reverse('client-list'), HTTP_AUTHORIZATION=f'Bearer {token}'
+            )
+
+        assert [
+            record.getMessage()
+            for record in caplog.records
+            if record.name == 'crm.middleware'
+        ] == ["GET client-list: 2 queries, over the budget of 1"]
+
+    @pytest.mark.django_db
+    def test_warning_on_duplicated_queries(
+        self, client_one, sales_member_one, settings, caplog
+    ):
+        """A statement run several times in a request is logged."""
+
+        settings.CRM_QUERY_BUDGETS = {
+            'DEFAULT': {'QUERIES': 20, 'TIME_MS': 10000},
+            'ROUTES': {},
+            'DUPLICATE_THRESHOLD': 2,
+        }
+        token = self.login(username="sales1", password="vente1111")
+        data = {
+            'first_name': 'sam',
+            'last_name': 'idilbi',
+            'email': 'sam@test.com',
+            'phone': '0222222222',
+            'mobile': '0622222222',
+            'company_name': 'company one',
+        }
+
+        with caplog.at_level(logging.WARNING, logger='crm.middleware'):
+            # The user is loaded by the authentication, then again
+            # to validate the sales contact.
+            self.client.put(
+                reverse('client-detail', args=[client_one.id]),
+                data,
+                HTTP_AUTHORIZATION=f'Bearer {token}',
+                format='json',
+            )
+
+        messages = [
+            record.getMessage()
+            for record in caplog.records
+            if record.name == 'crm.middleware'
+        ]
+        assert len(messages) == 1
+        assert messages[0].startswith(
+            'PUT client-detail: same query run 2 times: SELECT "users_user"'
+        )
@@ -0,0 +1,131 @@
+import pytest
+from rest_framework.test import APIClient
+
+from django.core.cache import cache
+from django.urls import reverse
+
+from crm.db import replicas
+from crm.db.replicas import ReplicaRouter, reading_from_replicas
+from crm.events.models import Client
+
+
+@pytest.fixture
+def replica_reads(settings, monkeypatch):
+    """Record the reads routed to a replica, served by `default` as the
+    test database has no replica."""
+    settings.CRM_REPLICAS = {'ALIASES': ['replica1'], 'STICKY_SECONDS': 5}
+    settings.CRM_RESPONSE_CACHE = {'ALIAS': None}
+    reads = []
+
+    def choose_replica():
+        reads.append('replica1')
+        return 'default'
+
+    monkeypatch.setattr(replicas, 'choose_replica', choose_replica)
+    cache.clear()
+    return reads
+
+
+class TestReplicas:
+    client = APIClient()
+
+    def login(self, username, password):
+        credentials = {"username": username, "password": password}
+        response_login = self.client.post(reverse('login'), credentials)
+        token = response_login.data['access']
+
+        return token
+
+    def test_router(self, settings):
+        """Only the reads inside reading_from_replicas go to a replica."""
+
+        settings.CRM_REPLICAS = {'ALIASES': ['replica1'], 'STICKY_SECONDS': 5}
+        router = ReplicaRouter()
+
+        assert router.db_for_read(Client) is None
+        with reading_from_replicas():
+            assert router.db_for_read(Client) == 'replica1'
+            assert router.db_for_write(Client) == 'default'
+        assert router.db_for_read(Client) is None
+        assert not router.allow_migrate('replica1', 'events')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_safe_requests_read_from_replicas(
+        self, client_one, sales_member_one, replica_reads
+    ):
+        """A GET on a viewset reads from a replica."""
+
+        token = self.login(username="sales1", password="vente1111")
+
+        response = self.client.get(
+            reverse('client-list'), HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+
+        assert response.status_code == 200
+        assert replica_reads
+
+    @pytest.mark.django_db(transaction=True)
+    def test_read_your_writes(
+        self, client_one, sales_member_one, replica_reads
+    ):
+        """After a write, the user reads from the primary for a while."""
+
+        token = self.login(username="sales1", password="vente1111")
+        data = {
+            "first_name": "Jean",
+            "last_name": "Dupont",
+            "email": "jean.dupont@gmail.com",
+            "phone": "0600000000",
+            "mobile": "0600000000",
+            "company_name": "Dupont",
+        }
+
+        response = self.client.post(
+            reverse('client-list'), data, HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+        assert response.status_code == 201
+        response = self.client.get(
+            reverse('client-list'), HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+
+        assert response.status_code == 200
+        assert replica_reads == []
+
+        cache.delete(
+            replicas.PINNED_CACHE_KEY.format(user_id=sales_member_one.id)
+        )
+        self.client.get(
+            reverse('client-list'), HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+        assert replica_reads
+
+    @pytest.mark.django_db
+    def test_transaction_reads_from_primary(
+        self, client_one, sales_member_one, replica_reads
+    ):
+        """Inside a transaction the reads stay on the primary."""
+
+        token = self.login(username="sales1", password="vente1111")
+
+        self.client.get(
+            reverse('client-list'), HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+
+        assert replica_reads == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_export_reads_from_replicas(
+        self, contract_one, sales_member_one, replica_reads
+    ):
+        """The streamed export reads from a replica, within the request."""
+
+        token = self.login(username="sales1", password="vente1111")
+
+        response = self.client.get(
+            reverse('contract-export'), HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+        rows = b''.join(response.streaming_content).decode().splitlines()
+
+        assert len(rows) == 2
+        assert replica_reads
+        assert 'desc="0 queries"' not in response['Server-Timing']
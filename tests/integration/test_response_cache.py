@@ -0,0 +1,160 @@
+import pytest
+from rest_framework.test import APIClient
+
+from django.urls import reverse
+
+from crm.events.models import Client, Contract, Event
+
+
+class TestResponseCache:
+    client = APIClient()
+
+    def login(self, username, password):
+        credentials = {"username": username, "password": password}
+        response_login = self.client.post(reverse('login'), credentials)
+        token = response_login.data['access']
+
+        return token
+
+    def list(self, url_name, token, query=''):
+        return self.client.get(
+            reverse(url_name) + query, HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+
+    @pytest.mark.django_db
+    def test_cached_list(
+        self, client_one, sales_member_one, django_assert_num_queries
+    ):
+        """A list is served from the cache per query string."""
+
+        token = self.login(username="sales1", password="vente1111")
+        response = self.list('client-list', token)
+
+        with django_assert_num_queries(0):
+            cached = self.list('client-list', token)
+        assert cached.status_code == 200
+        assert cached.data == response.data
+        assert cached['ETag'] == response['ETag']
+
+        with django_assert_num_queries(0):
+            not_modified = self.client.get(
+                reverse('client-list'),
+                HTTP_AUTHORIZATION=f'Bearer {token}',
+                HTTP_IF_NONE_MATCH=response['ETag'],
+            )
+        assert not_modified.status_code == 304
+
+        response = self.list('client-list', token, '?last_name=unknown')
+        assert response.data['count'] == 0
+
+    @pytest.mark.django_db
+    def test_invalidated_by_a_change(
+        self, event_one, sales_member_one, support_member_one
+    ):
+        """Saving an event invalidates the lists of its sales and support
+        contacts."""
+
+        sales_token = self.login(username="sales1", password="vente1111")
+        support_token = self.login(username="support1", password="help1111")
+        self.list('event-list', sales_token)
+        self.list('client-list', support_token, '?expand=events')
+
+        event = Event.objects.get(pk=event_one.pk)
+        event.attendees = 500
+        event.save()
+
+        response = self.list('event-list', sales_token)
+        assert response.data['results'][0]['attendees'] == 500
+        response = self.list('client-list', support_token, '?expand=events')
+        assert response.data['results'][0]['events'][0]['attendees'] == 500
+
+    @pytest.mark.django_db
+    def test_invalidation_is_scoped(
+        self,
+        client_one,
+        client_two,
+        sales_member_one,
+        sales_member_two,
+        django_assert_num_queries,
+    ):
+        """A change only invalidates the lists of the affected users."""
+
+        Client.objects.filter(pk=client_two.pk).update(
+            sales_contact=sales_member_two
+        )
+        token_one = self.login(username="sales1", password="vente1111")
+        token_two = self.login(username="sales2", password="vente2222")
+        self.list('client-list', token_one)
+        self.list('client-list', token_two)
+
+        client = Client.objects.get(pk=client_one.pk)
+        client.last_name = 'renamed'
+        client.save()
+
+        with django_assert_num_queries(0):
+            self.list('client-list', token_two)
+        response = self.list('client-list', token_one)
+        assert response.data['results'][0]['last_name'] == 'renamed'
+
+    @pytest.mark.django_db
+    def test_moved_object_invalidates_previous_contact(
+        self, contract_one, sales_member_one, sales_member_two
+    ):
+        """The previous sales contact of a moved contract sees it leave."""
+
+        token = self.login(username="sales1", password="vente1111")
+        assert self.list('contract-list', token).data['count'] == 1
+
+        contract = Contract.objects.get(pk=contract_one.pk)
+        contract.sales_contact = sales_member_two
+        contract.save()
+
+        assert self.list('contract-list', token).data['count'] == 0
+
+    @pytest.mark.django_db
+    def test_invalidated_by_bulk_create(self, client_one, sales_member_one):
+        """bulk_create sends no signal but invalidates the lists."""
+
+        token = self.login(username="sales1", password="vente1111")
+        assert self.list('contract-list', token).data['count'] == 0
+
+        response = self.client.post(
+            reverse('contract-list'),
+            [
+                {
+                    'client': client_one.id,
+                    'signed_status': True,
+                    'amount': 1000.0,
+                    'payment_due': '2023-02-28',
+                }
+            ],
+            format='json',
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+        )
+        assert response.status_code == 201
+
+        assert self.list('contract-list', token).data['count'] == 1
+
+    @pytest.mark.django_db
+    def test_support_contract_list_invalidated(
+        self, contract_one, sales_member_one, support_member_one
+    ):
+        """The support members see every contract, so a contract change
+        invalidates their list without an event on its client."""
+
+        token = self.login(username="support1", password="help1111")
+        assert self.list('contract-list', token).data['count'] == 1
+
+        contract = Contract.objects.get(pk=contract_one.pk)
+        contract.amount = 999.0
+        contract.save()
+        Contract.objects.create(
+            sales_contact=sales_member_one,
+            client=contract_one.client,
+            amount=10.0,
+            payment_due="2023-03-01",
+        )
+
+        response = self.list('contract-list', token)
+        assert response.data['count'] == 2
+        assert 999.0 in [row['amount'] for row in response.data['results']]
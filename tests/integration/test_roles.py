@@ -0,0 +1,72 @@
+import pytest
+
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+
+from crm.users.models import User
+from crm.users.roles import (
+    VERSION_CACHE_KEY,
+    get_roles,
+    is_sales,
+    is_support,
+)
+
+
+class TestRoles:
+    @pytest.mark.django_db
+    def test_roles_are_loaded_once_per_request(
+        self, sales_member_one, django_assert_num_queries
+    ):
+        """The group names are fetched once then read from the user."""
+
+        cache.clear()
+        user = User.objects.get(pk=sales_member_one.pk)
+
+        with django_assert_num_queries(1):
+            get_roles(user)
+
+        with django_assert_num_queries(0):
+            assert is_sales(user)
+            assert not is_support(user)
+            assert get_roles(user) == {'Sales'}
+
+    @pytest.mark.django_db
+    def test_roles_are_cached_between_requests(
+        self, sales_member_one, django_assert_num_queries
+    ):
+        """A new user instance reuses the cached group names."""
+
+        get_roles(User.objects.get(pk=sales_member_one.pk))
+        user = User.objects.get(pk=sales_member_one.pk)
+
+        with django_assert_num_queries(0):
+            assert is_sales(user)
+
+    @pytest.mark.django_db
+    def test_roles_are_invalidated_when_groups_change(self, sales_member_one):
+        """Adding the user to a group invalidates the cached roles."""
+
+        get_roles(User.objects.get(pk=sales_member_one.pk))
+        support_group, created = Group.objects.get_or_create(name='Support')
+        support_group.user_set.add(sales_member_one)
+
+        user = User.objects.get(pk=sales_member_one.pk)
+
+        assert get_roles(user) == {'Sales', 'Support'}
+
+        sales_member_one.groups.clear()
+        user = User.objects.get(pk=sales_member_one.pk)
+
+        assert get_roles(user) == frozenset()
+
+    @pytest.mark.django_db
+    def test_lost_version_does_not_match_older_roles(self, sales_member_one):
+        """A version evicted by the cache does not start again from a value
+        the older roles entries were stored under."""
+
+        get_roles(User.objects.get(pk=sales_member_one.pk))
+        sales_member_one.groups.clear()
+        cache.delete(VERSION_CACHE_KEY.format(user_id=sales_member_one.pk))
+        user = User.objects.get(pk=sales_member_one.pk)
+
+        assert get_roles(user) == frozenset()
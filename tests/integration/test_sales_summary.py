@@ -0,0 +1,292 @@
+from datetime import date, timedelta
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from crm.events.models import Contract, Event, SalesSummary
+from crm.users.models import User
+
+
+class TestSalesSummary:
+    client = APIClient()
+
+    def login(self, username, password):
+        credentials = {"username": username, "password": password}
+        response_login = self.client.post(reverse('login'), credentials)
+        token = response_login.data['access']
+
+        return token
+
+    def get_summary(self, token, query=''):
+        return self.client.get(
+            reverse('sales-summary') + query,
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+        )
+
+    @pytest.mark.django_db
+    def test_updated_on_save(self, contract_one, contract_two, event_one):
+        """The summary follows the saved clients, contracts and events."""
+
+        summary = SalesSummary.objects.get(
+            sales_contact=contract_one.sales_contact
+        )
+        assert summary.client_count == 2
+        assert summary.open_contract_count == 1
+        assert summary.open_contract_amount == 50.0
+        assert summary.signed_contract_count == 1
+        assert summary.signed_contract_amount == 100.0
+        # Unsigned and due on 2023-02-28
+        assert summary.overdue_contract_count == 1
+        # The event took place on 2023-02-25
+        assert summary.next_event_date is None
+
+        upcoming = date.today() + timedelta(days=3)
+        Event.objects.create(
+            client=event_one.client,
+            support_contact=event_one.support_contact,
+            attendees=10,
+            event_date=upcoming,
+        )
+        contract_two.signed_status = True
+        contract_two.save()
+
+        summary.refresh_from_db()
+        assert summary.next_event_date == upcoming
+        assert summary.open_contract_count == 0
+        assert summary.signed_contract_amount == 150.0
+        assert summary.overdue_contract_count == 0
+
+    @pytest.mark.django_db
+    def test_moved_and_deleted(
+        self,
+        contract_one,
+        sales_member_two,
+        django_capture_on_commit_callbacks,
+    ):
+        """Both sales contacts of a moved contract are updated, and the
+        cascade delete of a client updates its sales contact once
+        committed."""
+
+        sales_member_one = contract_one.sales_contact
+        contract_one.sales_contact = sales_member_two
+        contract_one.save()
+
+        assert sales_member_one.sales_summary.signed_contract_count == 0
+        assert sales_member_two.sales_summary.signed_contract_count == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            contract_one.client.delete()
+
+        assert not Contract.objects.exists()
+        sales_member_one.sales_summary.refresh_from_db()
+        sales_member_two.sales_summary.refresh_from_db()
+        assert sales_member_one.sales_summary.client_count == 0
+        assert sales_member_two.sales_summary.signed_contract_count == 0
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('number', [1, 20])
+    def test_cascade_delete_refreshed_once(
+        self,
+        client_one,
+        support_member_one,
+        django_capture_on_commit_callbacks,
+        settings,
+        number,
+    ):
+        """A cascade delete collects the sales contacts without a query and
+        refreshes their summaries once, whatever the number of rows."""
+
+        # Without the queries invalidating the cached lists.
+        settings.CRM_RESPONSE_CACHE = {'ALIAS': None}
+
+        for _ in range(number):
+            Contract.objects.create(
+                sales_contact=client_one.sales_contact,
+                client=client_one,
+                amount=10.0,
+                payment_due=date.today(),
+            )
+            Event.objects.create(
+                client=client_one,
+                support_contact=support_member_one,
+                attendees=10,
+                event_date=date.today(),
+            )
+
+        with CaptureQueriesContext(connection) as queries:
+            with django_capture_on_commit_callbacks() as callbacks:
+                client_one.delete()
+        # Only the contracts and the events collected by the delete.
+        selects = [q for q in queries if q['sql'].startswith('SELECT')]
+        assert len(selects) == 2
+
+        with CaptureQueriesContext(connection) as queries:
+            for callback in callbacks:
+                callback()
+
+        # One refresh: the clients of the events, the summary computed and
+        # stored.
+        assert len(callbacks) == 1
+        assert len(queries) == 3
+        summary = SalesSummary.objects.get(pk=client_one.sales_contact_id)
+        assert summary.client_count == 0
+        assert summary.open_contract_count == 0
+
+    @pytest.mark.django_db
+    def test_events_deleted(
+        self, event_one, client_two, django_capture_on_commit_callbacks
+    ):
+        """Deleting events refreshes the summary of their client."""
+
+        Event.objects.create(
+            client=client_two,
+            support_contact=event_one.support_contact,
+            attendees=10,
+            event_date=date.today() + timedelta(days=3),
+        )
+        summary = client_two.sales_contact.sales_summary
+        assert summary.next_event_date is not None
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Event.objects.all().delete()
+
+        summary.refresh_from_db()
+        assert summary.next_event_date is None
+
+    @pytest.mark.django_db
+    def test_user_deleted(self, event_one, sales_member_one):
+        """The summary is deleted with its user."""
+
+        sales_member_one.delete()
+
+        assert not SalesSummary.objects.exists()
+        assert not User.objects.filter(username="sales1").exists()
+
+    @pytest.mark.django_db
+    def test_read_endpoint(self, contract_one, sales_member_one):
+        """The sales user reads their summary in one query."""
+
+        token = self.login(username="sales1", password="vente1111")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get_summary(token)
+
+        assert response.status_code == 200
+        assert response.data['sales_contact'] == sales_member_one.id
+        assert response.data['signed_contract_amount'] == 100.0
+        assert response.data['computed_on'] == date.today().isoformat()
+        assert len(queries) == 1
+
+    @pytest.mark.django_db
+    def test_computed_again_on_read(self, contract_one, sales_member_one):
+        """A missing summary or one of an earlier day is computed again."""
+
+        token = self.login(username="sales1", password="vente1111")
+        SalesSummary.objects.update(
+            computed_on=date.today() - timedelta(days=1),
+            signed_contract_count=5,
+        )
+
+        response = self.get_summary(token)
+
+        assert response.data['signed_contract_count'] == 1
+        SalesSummary.objects.all().delete()
+        assert self.get_summary(token).data['signed_contract_count'] == 1
+
+    @pytest.mark.django_db
+    def test_read_permissions(self, contract_one, support_member_one):
+        """Support users have no summary, managers choose the sales
+        user."""
+
+        token = self.login(username="support1", password="help1111")
+        assert self.get_summary(token).status_code == 403
+
+        manager = User.objects.create_user(
+            username="manager", password="gestion1111"
+        )
+        token = self.login(username="manager", password="gestion1111")
+        response = self.get_summary(
+            token, f'?sales_contact={contract_one.sales_contact_id}'
+        )
+        assert response.data['signed_contract_count'] == 1
+        assert self.get_summary(token, '?sales_contact=404').status_code == 404
+        assert self.get_summary(token, '?sales_contact=x').status_code == 400
+
+        # Only the sales users have a summary.
+        assert self.get_summary(token).status_code == 404
+        for user in (manager, support_member_one):
+            response = self.get_summary(token, f'?sales_contact={user.id}')
+            assert response.status_code == 404
+        assert not SalesSummary.objects.exclude(
+            sales_contact=contract_one.sales_contact
+        ).exists()
+
+    @pytest.mark.django_db
+    def test_command(self, contract_one, contract_two, sales_member_two):
+        """The command finds and rebuilds the out of date summaries."""
+
+        # QuerySet.update sends no signal.
+        Contract.objects.filter(pk=contract_two.pk).update(signed_status=True)
+
+        with pytest.raises(CommandError):
+            call_command('sales_summaries', verify=True)
+
+        call_command('sales_summaries', batch_size=1)
+        call_command('sales_summaries', verify=True)
+
+        summary = SalesSummary.objects.get(pk=contract_one.sales_contact_id)
+        assert summary.signed_contract_count == 2
+        # A sales user without client has an empty summary.
+        assert (
+            SalesSummary.objects.get(pk=sales_member_two.pk).client_count == 0
+        )
+
+    @pytest.mark.django_db
+    def test_only_sales_users_have_a_summary(
+        self, client_one, sales_member_one, sales_member_two
+    ):
+        """The signals and the command follow the rule of the endpoint:
+        only the members of the sales group have a summary."""
+
+        manager = User.objects.create_user(
+            username="manager", password="gestion1111"
+        )
+        client_one.sales_contact = manager
+        client_one.save()
+        assert not SalesSummary.objects.filter(pk=manager.pk).exists()
+
+        call_command('sales_summaries')
+        sales_member_two.groups.clear()
+        with pytest.raises(CommandError):
+            call_command('sales_summaries', verify=True)
+
+        call_command('sales_summaries')
+        call_command('sales_summaries', verify=True)
+        assert set(SalesSummary.objects.values_list('pk', flat=True)) == {
+            sales_member_one.pk
+        }
+
+    @pytest.mark.django_db
+    @pytest.mark.skipif(
+        connection.vendor != 'postgresql',
+        reason="Advisory locks are a PostgreSQL feature.",
+    )
+    def test_refresh_locks_the_summary(self, sales_member_one):
+        """The refresh takes an advisory lock, not a lock of the user."""
+
+        with CaptureQueriesContext(connection) as queries:
+            SalesSummary.refresh([sales_member_one.pk])
+
+        assert 'pg_advisory_xact_lock' in queries[0]['sql']
+        assert not any('FOR UPDATE' in query['sql'] for query in queries)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT count(*) FROM pg_locks WHERE locktype = 'advisory' "
+                "AND pid = pg_backend_pid()"
+            )
+            assert cursor.fetchone() == (1,)
@@ -0,0 +1,54 @@
+import pytest
+from rest_framework.test import APIClient
+
+from django.urls import reverse
+
+
+class TestSearch:
+    client = APIClient()
+
+    def login(self, username, password):
+        credentials = {"username": username, "password": password}
+        response_login = self.client.post(reverse('login'), credentials)
+        token = response_login.data['access']
+
+        return token
+
+    def search(self, url_name, query, token):
+        response = self.client.get(
+            reverse(url_name) + f'?q={query}',
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+        )
+        return [item['id'] for item in response.data['results']]
+
+    @pytest.mark.django_db
+    def test_search_clients(self, client_one, client_two, sales_member_one):
+        """A sales member can search his clients by name or email."""
+
+        token = self.login(username="sales1", password="vente1111")
+
+        assert self.search('client-list', 'IDIL', token) == [client_one.id]
+        assert self.search('client-list', 'pierre@', token) == [client_two.id]
+        assert self.search('client-list', 'unknown', token) == []
+
+    @pytest.mark.django_db
+    def test_search_contracts(
+        self, contract_one, contract_two, sales_member_one
+    ):
+        """The contracts can be searched by the name of their client."""
+
+        token = self.login(username="sales1", password="vente1111")
+
+        assert self.search('contract-list', 'sam', token) == [contract_one.id]
+        assert self.search('contract-list', 'parou', token) == [
+            contract_two.id
+        ]
+
+    @pytest.mark.django_db
+    def test_search_events(self, event_one, support_member_one):
+        """The events can be searched by the email of their client."""
+
+        token = self.login(username="support1", password="help1111")
+
+        assert self.search('event-list', 'sam@test', token) == [event_one.id]
+        assert self.search('event-list', 'pierre', token) == []
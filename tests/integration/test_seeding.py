@@ -0,0 +1,80 @@
+from datetime import date, timedelta
+
+import pytest
+
+from django.core.management import call_command
+
+from crm.events.models import Client, Contract, Event
+from crm.events.seeding import get_volumes, seed, unseed
+from crm.users.models import User
+
+
+class TestSeedCommand:
+    @pytest.mark.django_db
+    def test_seed_crm(self):
+        """The command creates the volumes of the given scale."""
+
+        call_command('seed_crm', scale=0.001)
+
+        volumes = get_volumes(0.001)
+        assert User.objects.filter(groups__name='Sales').count() == (
+            volumes['sales']
+        )
+        assert Client.objects.count() == volumes['clients']
+        assert Contract.objects.count() == volumes['contracts']
+        assert Event.objects.count() == volumes['events']
+        assert not Client.objects.filter(has_active_contract=False).exists()
+
+    @pytest.mark.django_db
+    def test_seed_crm_is_deterministic(self):
+        """Seeding again with --clear gives the same data."""
+
+        call_command('seed_crm', scale=0.001)
+        amounts = list(
+            Contract.objects.order_by('id').values_list('amount', flat=True)
+        )
+
+        call_command('seed_crm', scale=0.001, clear=True)
+
+        assert (
+            list(
+                Contract.objects.order_by('id').values_list(
+                    'amount', flat=True
+                )
+            )
+            == amounts
+        )
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('scale', [0.001, 0.002])
+    def test_unseed_in_constant_queries(
+        self,
+        event_one,
+        sales_member_one,
+        django_assert_max_num_queries,
+        django_capture_on_commit_callbacks,
+        scale,
+    ):
+        """The seeded rows are deleted in bulk, and the rows of the other
+        users they touched are refreshed once."""
+
+        seeded = seed(scale, prefix="test_")
+        seeded_support = seeded['support'][0]
+        Event.objects.create(
+            client=event_one.client,
+            support_contact=seeded_support,
+            attendees=10,
+            event_date=date.today() + timedelta(days=3),
+        )
+        assert sales_member_one.sales_summary.next_event_date is not None
+
+        with django_capture_on_commit_callbacks(execute=True):
+            with django_assert_max_num_queries(20):
+                unseed(prefix="test_")
+
+        assert not User.objects.filter(username__startswith="test_").exists()
+        assert list(Event.objects.all()) == [event_one]
+        assert Client.objects.count() == 1
+        assert not Contract.objects.exists()
+        sales_member_one.sales_summary.refresh_from_db()
+        assert sales_member_one.sales_summary.next_event_date is None
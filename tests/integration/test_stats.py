@@ -0,0 +1,151 @@
+from datetime import date, timedelta
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from crm.events.models import Contract, Event
+
+
+class TestStats:
+    client = APIClient()
+
+    def login(self, username, password):
+        credentials = {"username": username, "password": password}
+        response_login = self.client.post(reverse('login'), credentials)
+        token = response_login.data['access']
+
+        return token
+
+    def get_stats(self, token):
+        return self.client.get(
+            reverse('stats'), HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+
+    @pytest.mark.django_db
+    def test_contract_stats(
+        self, contract_one, contract_two, sales_member_one, sales_member_two
+    ):
+        """The contracts of the sales member are grouped in SQL."""
+
+        Contract.objects.create(
+            sales_contact=sales_member_two,
+            client=contract_one.client,
+            signed_status=True,
+            amount=1000.0,
+            payment_due="2023-03-15",
+        )
+        token = self.login(username="sales1", password="vente1111")
+
+        response = self.get_stats(token)
+
+        assert response.status_code == 200
+        contracts = response.data['contracts']
+        assert contracts['total'] == {'count': 2, 'amount': 150.0, 'signed': 1}
+        assert contracts['by_month'] == [
+            {
+                'month': date(2023, 2, 1),
+                'count': 2,
+                'amount': 150.0,
+                'signed': 1,
+            }
+        ]
+        assert contracts['by_sales_contact'] == [
+            {
+                'sales_contact': sales_member_one.id,
+                'count': 2,
+                'amount': 150.0,
+                'signed': 1,
+            }
+        ]
+        assert contracts['by_signed_status'] == [
+            {'signed_status': False, 'count': 1, 'amount': 50.0},
+            {'signed_status': True, 'count': 1, 'amount': 100.0},
+        ]
+
+    @pytest.mark.django_db
+    def test_event_stats(self, event_one, support_member_one):
+        """Attendees by week and upcoming events by support contact."""
+
+        upcoming = date.today() + timedelta(days=7)
+        Event.objects.create(
+            client=event_one.client,
+            support_contact=support_member_one,
+            attendees=20,
+            event_date=upcoming,
+        )
+        token = self.login(username="support1", password="help1111")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get_stats(token)
+
+        events = response.data['events']
+        assert [week['attendees'] for week in events['by_week']] == [100, 20]
+        assert events['by_week'][0]['week'] == date(2023, 2, 20)
+        assert events['upcoming_by_support_contact'] == [
+            {
+                'support_contact': support_member_one.id,
+                'count': 1,
+                'attendees': 20,
+            }
+        ]
+        # No contract in the fixtures, one query per model.
+        assert response.data['contracts']['total']['count'] == 0
+        assert len(queries) == 2
+
+    @pytest.mark.django_db
+    def test_cached_until_write(self, contract_one, sales_member_one):
+        """The stats are cached until a contract of the user changes."""
+
+        token = self.login(username="sales1", password="vente1111")
+        self.get_stats(token)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get_stats(token)
+        assert len(queries) == 0
+        assert response.data['contracts']['total']['count'] == 1
+
+        Contract.objects.create(
+            sales_contact=sales_member_one,
+            client=contract_one.client,
+            signed_status=False,
+            amount=10.0,
+            payment_due="2023-02-01",
+        )
+
+        response = self.get_stats(token)
+        assert response.data['contracts']['total']['count'] == 2
+
+    @pytest.mark.django_db
+    def test_authentication_required(self):
+        """Anonymous users get no stats."""
+
+        response = self.client.get(reverse('stats'))
+
+        assert response.status_code == 401
+
+    @pytest.mark.django_db
+    def test_support_sees_every_contract(
+        self, event_one, contract_two, support_member_one, sales_member_one
+    ):
+        """The support members count every contract, including those of
+        clients without any of their events, and see them change."""
+
+        token = self.login(username="support1", password="help1111")
+
+        response = self.get_stats(token)
+        assert response.data['contracts']['total'] == {
+            'count': 1,
+            'amount': 50.0,
+            'signed': 0,
+        }
+
+        contract = Contract.objects.get(pk=contract_two.pk)
+        contract.signed_status = True
+        contract.save()
+
+        response = self.get_stats(token)
+        assert response.data['contracts']['total']['signed'] == 1
@@ -176,7 +176,19 @@ class TestGetClient:
             'sales_contact': sales_member_one.id,
             'date_created': date_created,
             'date_updated': date_updated,
-            'events': [event_one.id],
+            'events': [
+                {
+                    'id': event_one.id,
+                    'client': client_one.id,
+                    'date_created': date_created,
+                    'date_updated': date_updated,
+                    'support_contact': support_member_one.id,
+                    'event_status': event_one.event_status_id,
+                    'attendees': 100,
+                    'event_date': '2023-02-25',
+                    'notes': 'évènement de test',
+                }
+            ],
             'contracts': [],
         }
 
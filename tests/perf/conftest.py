@@ -0,0 +1,20 @@
+import os
+
+import pytest
+
+from crm.events.seeding import seed, unseed
+
+PERF_PASSWORD = "perf1111"
+
+
+@pytest.fixture(scope='module')
+def perf_data(django_db_setup, django_db_blocker):
+    """Seed the benchmark data once for the module and remove it after.
+
+    CRM_PERF_SCALE sets the volume (1 = 10k clients, 100k contracts and
+    events).
+    """
+    scale = float(os.environ.get('CRM_PERF_SCALE', 0.01))
+    with django_db_blocker.unblock():
+        yield seed(scale, password=PERF_PASSWORD, prefix="perf_")
+        unseed(prefix="perf_")
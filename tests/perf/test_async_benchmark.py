@@ -0,0 +1,70 @@
+"""Throughput of the event list through the WSGI viewset and the async view.
+
+Run with `-s` to see the results. The WSGI path serves the requests one
+after the other, like a sync worker; the async path serves
+CRM_BENCH_CONCURRENCY concurrent requests on one event loop.
+"""
+import asyncio
+import os
+import time
+
+from asgiref.sync import async_to_sync
+from rest_framework.test import APIClient
+
+from django.test import AsyncClient
+from django.urls import reverse
+
+from .conftest import PERF_PASSWORD
+
+REQUESTS = int(os.environ.get('CRM_BENCH_REQUESTS', 50))
+CONCURRENCY = int(os.environ.get('CRM_BENCH_CONCURRENCY', 10))
+
+
+def get_token():
+    response = APIClient().post(
+        reverse('login'),
+        {"username": "perf_sales0", "password": PERF_PASSWORD},
+    )
+    return response.data['access']
+
+
+def run_wsgi(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    for i in range(REQUESTS):
+        response = client.get(reverse('event-list'))
+        assert response.status_code == 200
+
+
+async def run_asgi(token):
+    client = AsyncClient()
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def get():
+        async with semaphore:
+            response = await client.get(
+                reverse('async-event-list'), AUTHORIZATION=f"Bearer {token}"
+            )
+        assert response.status_code == 200
+
+    await asyncio.gather(*(get() for i in range(REQUESTS)))
+
+
+def test_event_list_throughput(perf_data, django_db_blocker, settings):
+    # The async views have no response cache.
+    settings.CRM_RESPONSE_CACHE = {'ALIAS': None}
+    with django_db_blocker.unblock():
+        token = get_token()
+
+        start = time.perf_counter()
+        run_wsgi(token)
+        wsgi = REQUESTS / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        async_to_sync(run_asgi)(token)
+        asgi = REQUESTS / (time.perf_counter() - start)
+
+    print(
+        f"\n/api/events/: WSGI {wsgi:.1f} requests/s, "
+        f"async {asgi:.1f} requests/s ({CONCURRENCY} concurrent)"
+    )
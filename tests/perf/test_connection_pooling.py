@@ -0,0 +1,88 @@
+"""Latency of /api/events/ with a new, a persistent or a pooled connection.
+
+Run with `-s` to see the results. Only meaningful on PostgreSQL, where
+opening a connection costs a TCP and authentication handshake. The
+timings are only reported: the assertions are on the server connections
+used, which do not depend on the load of the machine.
+"""
+import os
+import statistics
+import time
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.db import connection, connections
+from django.urls import reverse
+
+from crm.db.pooled_postgresql.base import DatabaseWrapper
+
+from .conftest import PERF_PASSWORD
+
+REQUESTS = int(os.environ.get('CRM_BENCH_REQUESTS', 50))
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'postgresql', reason="PostgreSQL only"
+)
+
+
+def measure(api, close):
+    """Return the median latency (ms) of the event list and the server
+    process ids of the connections used.
+
+    The test client does not close the connection at the end of a
+    request, so `close` does what CONN_MAX_AGE=0 does.
+    """
+    latencies = []
+    backend_pids = set()
+    for i in range(REQUESTS):
+        start = time.perf_counter()
+        response = api.get(reverse('event-list'))
+        backend_pids.add(connections['default'].connection.get_backend_pid())
+        if close:
+            connections['default'].close()
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200
+    return statistics.median(latencies), backend_pids
+
+
+def test_event_list_latency(perf_data, django_db_blocker):
+    with django_db_blocker.unblock():
+        api = APIClient()
+        response = api.post(
+            reverse('login'),
+            {"username": "perf_sales0", "password": PERF_PASSWORD},
+        )
+        api.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+        new, new_pids = measure(api, close=True)
+        persistent, persistent_pids = measure(api, close=False)
+
+        connections['default'].close()
+        default = connections['default']
+        pooled_connection = DatabaseWrapper(
+            {**default.settings_dict, 'POOL': {'MIN_SIZE': 1, 'MAX_SIZE': 2}},
+            'default',
+        )
+        connections['default'] = pooled_connection
+        try:
+            pooled, pooled_pids = measure(api, close=True)
+            connection_pool = pooled_connection.get_pool(
+                pooled_connection.get_connection_params()
+            )
+            # Every connection was given back to the pool.
+            assert not connection_pool._used
+            assert len(connection_pool._pool) <= 2
+        finally:
+            pooled_connection.close()
+            connections['default'] = default
+
+    print(
+        f"\n/api/events/ p50: new connection {new:.2f} ms, "
+        f"persistent {persistent:.2f} ms, pooled {pooled:.2f} ms"
+    )
+    # A connection per request (the server may reuse a process id), one
+    # for all the requests, and the connections of the pool reused.
+    assert len(new_pids) > 2
+    assert len(persistent_pids) == 1
+    assert len(pooled_pids) <= 2
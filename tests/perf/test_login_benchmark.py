@@ -0,0 +1,32 @@
+import os
+import time
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.urls import reverse
+
+from crm.users.models import User
+
+LOGINS = int(os.environ.get('CRM_BENCH_LOGINS', 10))
+
+
+@pytest.mark.django_db
+def test_logins_per_second_per_worker():
+    """Measure the login throughput of a single worker.
+
+    Run with `-s` to see the result, and CRM_BENCH_LOGINS to change
+    the number of logins.
+    """
+
+    User.objects.create_user(username="bench", password="bench1111")
+    client = APIClient()
+    credentials = {"username": "bench", "password": "bench1111"}
+
+    start = time.perf_counter()
+    for i in range(LOGINS):
+        response = client.post(reverse('login'), credentials)
+        assert response.status_code == 200
+    elapsed = time.perf_counter() - start
+
+    print(f"\nlogin: {LOGINS / elapsed:.1f} logins/s per worker")
@@ -0,0 +1,219 @@
+"""Query count, latency and allocation benchmark of every API route.
+
+The measures are written to tests/perf/results.json and compared with
+tests/perf/baseline.json:
+
+- the number of queries of a route must not exceed the baseline,
+- the p95 latency and the allocations are only compared when
+  CRM_PERF_TOLERANCE is set (e.g. 1.5 for +50%), as they depend on
+  the machine.
+
+CRM_PERF_SCALE sets the data volume (1 = 10k clients, 100k contracts and
+events), CRM_PERF_ITERATIONS the number of calls per route and
+CRM_PERF_UPDATE_BASELINE=1 rewrites the baseline from the results.
+"""
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+from rest_framework.test import APIClient
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from crm.events.models import Contract, Event
+
+from .conftest import PERF_PASSWORD
+
+BASELINE_PATH = Path(__file__).with_name('baseline.json')
+RESULTS_PATH = Path(__file__).with_name('results.json')
+ITERATIONS = int(os.environ.get('CRM_PERF_ITERATIONS', 10))
+TOLERANCE = os.environ.get('CRM_PERF_TOLERANCE')
+
+results = {}
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def measure(call):
+    """Call the route ITERATIONS times and return its measures."""
+    call()  # warm the caches
+
+    with CaptureQueriesContext(connection) as context:
+        response = call()
+    assert response.status_code < 400, response.data
+    # captured_queries reads the connection log, reset by the next request.
+    queries = len(context.captured_queries)
+
+    latencies = []
+    for i in range(ITERATIONS):
+        start = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    call()
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'queries': queries,
+        'p50_ms': round(statistics.median(latencies), 2),
+        'p95_ms': round(percentile(latencies, 0.95), 2),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def check_baseline(route, measures):
+    if not BASELINE_PATH.exists():
+        return
+    baseline = json.loads(BASELINE_PATH.read_text()).get(route)
+    if baseline is None:
+        return
+    assert measures['queries'] <= baseline['queries'], (
+        f"{route}: {measures['queries']} queries "
+        f"instead of {baseline['queries']}"
+    )
+    if TOLERANCE:
+        for name in ('p95_ms', 'peak_kb'):
+            limit = baseline[name] * float(TOLERANCE)
+            assert measures[name] <= limit, (
+                f"{route}: {name} {measures[name]} above {limit:.1f}"
+            )
+
+
+@pytest.fixture(scope='module', autouse=True)
+def write_results():
+    yield
+    RESULTS_PATH.write_text(json.dumps(results, indent=4, sort_keys=True))
+    if os.environ.get('CRM_PERF_UPDATE_BASELINE'):
+        BASELINE_PATH.write_text(
+            json.dumps(results, indent=4, sort_keys=True) + '\n'
+        )
+
+
+@pytest.fixture
+def api(perf_data):
+    """Return an API client logged in as the first sales member."""
+    client = APIClient()
+    response = client.post(
+        reverse('login'),
+        {"username": "perf_sales0", "password": PERF_PASSWORD},
+    )
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+    return client
+
+
+def client_payload(client):
+    return {
+        'first_name': client.first_name,
+        'last_name': client.last_name,
+        'email': client.email,
+        'phone': client.phone,
+        'mobile': client.mobile,
+        'company_name': client.company_name,
+    }
+
+
+def contract_payload(client):
+    return {
+        'client': client.id,
+        'signed_status': True,
+        'amount': 1000.0,
+        'payment_due': '2023-02-28',
+    }
+
+
+def event_payload(client, support_contact):
+    return {
+        'client': client.id,
+        'support_contact': support_contact.id,
+        'attendees': 100,
+        'event_date': '2023-02-28',
+        'notes': 'perf',
+    }
+
+
+def routes(perf_data, api):
+    sales = perf_data['sales'][0]
+    support = perf_data['support'][0]
+    client = perf_data['clients'][0]
+    contract = Contract.objects.filter(sales_contact=sales).first()
+    event = Event.objects.filter(client__sales_contact=sales).first()
+    return {
+        'login': lambda: APIClient().post(
+            reverse('login'),
+            {"username": sales.username, "password": PERF_PASSWORD},
+        ),
+        'client-list': lambda: api.get(reverse('client-list')),
+        'client-retrieve': lambda: api.get(
+            reverse('client-detail', args=[client.id])
+        ),
+        'client-create': lambda: api.post(
+            reverse('client-list'), client_payload(client), format='json'
+        ),
+        'client-update': lambda: api.put(
+            reverse('client-detail', args=[client.id]),
+            client_payload(client),
+            format='json',
+        ),
+        'contract-list': lambda: api.get(reverse('contract-list')),
+        'contract-retrieve': lambda: api.get(
+            reverse('contract-detail', args=[contract.id])
+        ),
+        'contract-create': lambda: api.post(
+            reverse('contract-list'), contract_payload(client), format='json'
+        ),
+        'contract-update': lambda: api.put(
+            reverse('contract-detail', args=[contract.id]),
+            contract_payload(client),
+            format='json',
+        ),
+        'event-list': lambda: api.get(reverse('event-list')),
+        'event-retrieve': lambda: api.get(
+            reverse('event-detail', args=[event.id])
+        ),
+        'event-create': lambda: api.post(
+            reverse('event-list'),
+            event_payload(client, support),
+            format='json',
+        ),
+        'event-update': lambda: api.put(
+            reverse('event-detail', args=[event.id]),
+            event_payload(client, support),
+            format='json',
+        ),
+    }
+
+
+ROUTES = [
+    'login',
+    'client-list',
+    'client-retrieve',
+    'client-create',
+    'client-update',
+    'contract-list',
+    'contract-retrieve',
+    'contract-create',
+    'contract-update',
+    'event-list',
+    'event-retrieve',
+    'event-create',
+    'event-update',
+]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('route', ROUTES)
+def test_route(perf_data, api, route):
+    measures = measure(routes(perf_data, api)[route])
+    results[route] = measures
+    check_baseline(route, measures)